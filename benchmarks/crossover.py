@@ -0,0 +1,55 @@
+"""Finds the size from which Strassen's algorithm beats the BLAS product.
+
+Run from the root of the repository:
+
+    python -m benchmarks.crossover
+    python -m benchmarks.crossover --sizes 512 1024 2048 4096
+
+For each size, times a square complex product through BLAS alone and
+through one level of Strassen's algorithm. The crossover is the first
+size from which Strassen is faster; use it as `STRASSEN_THRESHOLD`."""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from maths.multiply import matmul
+
+def measure(size, repeat = 3):
+    """Times a product of two random square complex matrices.
+
+    Args:
+        size (int): number of lines and columns.
+        repeat (int, optionnal): number of measures. Defaults to 3.
+
+    Returns:
+        tuple: best time through BLAS, and through Strassen, in seconds.
+    """
+    rand = np.random.default_rng(size)
+    left = rand.standard_normal((size, size)) + 1j * rand.standard_normal((size, size))
+    right = rand.standard_normal((size, size)) + 1j * rand.standard_normal((size, size))
+    blas = min(timeit.repeat(lambda: left @ right, number=1, repeat=repeat))
+    strassen = min(timeit.repeat(lambda: matmul(left, right, size), number=1, repeat=repeat))
+    return blas, strassen
+
+def main():
+    """Runs the comparison from the command line."""
+    parser = argparse.ArgumentParser(description="Strassen / BLAS crossover.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024, 2048, 4096])
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="number of measures.")
+    args = parser.parse_args()
+    crossover = None
+    print(f"{'size':>6} {'blas (s)':>10} {'strassen (s)':>13} {'ratio':>7}")
+    for size in args.sizes:
+        blas, strassen = measure(size, args.repeat)
+        print(f"{size:>6} {blas:>10.4f} {strassen:>13.4f} {strassen / blas:>7.2f}")
+        if crossover is None and strassen < blas:
+            crossover = size
+    if crossover is None:
+        print("Strassen never won, keep the threshold above the largest size.")
+    else:
+        print(f"Crossover at size {crossover}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Benchmark suite for the hot paths of the calculator.
+
+Run from the root of the repository:
+
+    python -m benchmarks.suite                      # run and print
+    python -m benchmarks.suite -o results.json      # save the results
+    python -m benchmarks.suite --compare            # compare to benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline      # replace benchmarks/baseline.json
+
+Every benchmark reports the best time per call, in seconds, over several
+repeats. Comparing exits with status 1 if a benchmark got slower than the
+baseline by more than the threshold."""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import sys
+import timeit
+
+from ft_parser import tokenize, parse
+from syntax_tree import build_ast, Node
+from maths.complex import Complex
+from maths.matrix import Matrix
+from equations.ft_maths import ft_sin, ft_cos, ft_fact
+from equations.equation_solver import parse_equation
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEPTHS = (2, 4, 8)
+MATRIX_SIZES = (4, 16, 32)
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Registers a benchmark. The decorated function prepares the data \
+    and returns the callable to time."""
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+def expression(depth, seed = 0):
+    """Generates a balanced expression of the given depth, using x, \
+    constants and all the binary operators.
+
+    Args:
+        depth (int): depth of the tree.
+        seed (int, optionnal): seed of the generator. Defaults to 0.
+
+    Returns:
+        str: the expression.
+    """
+    rand = random.Random(seed)
+    def generate(level):
+        if level == 0:
+            return rand.choice(["x", "2", "3.5", "1.25", "x"])
+        operator = rand.choice(["+", "-", "*", "+", "-"])
+        return f"({generate(level - 1)}{operator}{generate(level - 1)})"
+    return generate(depth)
+
+def square_matrix(size, seed = 0):
+    """Generates a square matrix of small random values.
+
+    Args:
+        size (int): number of lines and columns.
+        seed (int, optionnal): seed of the generator. Defaults to 0.
+
+    Returns:
+        Matrix: the matrix.
+    """
+    rand = random.Random(seed)
+    return Matrix([[Complex(rand.uniform(-1, 1)) for _ in range(size)]\
+        for _ in range(size)], False)
+
+def sparse_matrix(size, count, seed = 0):
+    """Generates a square matrix with `count` small random values, the \
+    others being zeros.
+
+    Args:
+        size (int): number of lines and columns.
+        count (int): number of random values.
+        seed (int, optionnal): seed of the generator. Defaults to 0.
+
+    Returns:
+        Matrix: the matrix.
+    """
+    rand = random.Random(seed)
+    values = [[0] * size for _ in range(size)]
+    for _ in range(count):
+        values[rand.randrange(size)][rand.randrange(size)] = rand.uniform(-1, 1)
+    return Matrix(values, False)
+
+for _depth in DEPTHS:
+    @benchmark(f"tokenize/depth={_depth}")
+    def _tokenize(depth = _depth):
+        value = expression(depth)
+        return lambda: tokenize(value)
+
+    @benchmark(f"parse/depth={_depth}")
+    def _parse(depth = _depth):
+        tokens = tokenize(expression(depth))
+        return lambda: parse(tokens)
+
+    @benchmark(f"build_ast/depth={_depth}")
+    def _build_ast(depth = _depth):
+        tokens = tokenize(expression(depth))
+        return lambda: build_ast(tokens)
+
+    @benchmark(f"reduce/depth={_depth}")
+    def _reduce(depth = _depth):
+        tree = build_ast(tokenize(expression(depth)))
+        return tree.reduce
+
+    @benchmark(f"solve/depth={_depth}")
+    def _solve(depth = _depth):
+        tree = build_ast(tokenize(expression(depth))).reduce()
+        x = Complex(1.5)
+        return lambda: tree.solve(x)
+
+for _size in MATRIX_SIZES:
+    @benchmark(f"matrix/matmul/size={_size}")
+    def _matmul(size = _size):
+        left, right = square_matrix(size, 1), square_matrix(size, 2)
+        return lambda: left @ right
+
+    @benchmark(f"matrix/mul/size={_size}")
+    def _mul(size = _size):
+        left, right = square_matrix(size, 1), square_matrix(size, 2)
+        return lambda: left * right
+
+    @benchmark(f"matrix/pow8/size={_size}")
+    def _pow(size = _size):
+        matrix = square_matrix(size)
+        matrix.cache_powers = False
+        return lambda: matrix ** 8
+
+    @benchmark(f"matrix/fused/size={_size}")
+    def _fused(size = _size):
+        first, second, third = (square_matrix(size, seed) for seed in range(3))
+        tree = Node('-', Node('+', Node(first), Node(second)),\
+            Node('*', Node(third), Node(Complex(2))))
+        return tree.solve
+
+@benchmark("matrix/sparse/matmul/size=500")
+def _sparse_matmul():
+    left, right = sparse_matrix(500, 1000, 1), sparse_matrix(500, 1000, 2)
+    return lambda: left @ right
+
+@benchmark("matrix/sparse/pow8/size=500")
+def _sparse_pow():
+    matrix = sparse_matrix(500, 1000)
+    matrix.cache_powers = False
+    return lambda: matrix ** 8
+
+@benchmark("complex/add")
+def _complex_add():
+    left, right = Complex(1.5, -2), Complex(0.25, 3)
+    return lambda: left + right
+
+@benchmark("complex/mul")
+def _complex_mul():
+    left, right = Complex(1.5, -2), Complex(0.25, 3)
+    return lambda: left * right
+
+@benchmark("complex/div")
+def _complex_div():
+    left, right = Complex(1.5, -2), Complex(0.25, 3)
+    return lambda: left / right
+
+@benchmark("complex/pow10")
+def _complex_pow():
+    value, exponent = Complex(1.01, 0.5), Complex(10)
+    return lambda: value ** exponent
+
+@benchmark("ft_maths/sin")
+def _sin():
+    return lambda: ft_sin(1.234)
+
+@benchmark("ft_maths/cos")
+def _cos():
+    return lambda: ft_cos(1.234)
+
+@benchmark("ft_maths/fact20")
+def _fact_small():
+    return lambda: ft_fact(20)
+
+@benchmark("ft_maths/fact1000")
+def _fact_large():
+    return lambda: ft_fact(1000)
+
+@benchmark("equation/run/degree1")
+def _equation_linear():
+    return lambda: parse_equation("3x+2-x=5+4x")
+
+@benchmark("equation/run/degree2")
+def _equation_quadratic():
+    return lambda: parse_equation("x^2+3x+2=x-4x^2+1")
+
+@benchmark("equation/run/degree10")
+def _equation_degree10():
+    return lambda: parse_equation("2x^10-3x^4+x=7")
+
+def measure(function, repeat = 5):
+    """Times a callable.
+
+    Args:
+        function (callable): what to time.
+        repeat (int, optionnal): number of measures. Defaults to 5.
+
+    Returns:
+        float: best time per call, in seconds.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+def run(pattern = None, repeat = 5):
+    """Runs the benchmarks.
+
+    Args:
+        pattern (str, optionnal): only runs the benchmarks whose name \
+        matches this regex. Defaults to None.
+        repeat (int, optionnal): number of measures. Defaults to 5.
+
+    Returns:
+        dict: time per call of each benchmark, by name.
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        function = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = measure(function, repeat)
+    return results
+
+def compare(results, baseline, threshold):
+    """Compares results against a baseline.
+
+    Args:
+        results (dict): time per call of each benchmark, by name.
+        baseline (dict): time per call of each benchmark, by name.
+        threshold (float): tolerated slowdown, ie 0.2 for 20%.
+
+    Returns:
+        list: names of the benchmarks that got slower than the threshold.
+    """
+    regressions = []
+    for name, value in results.items():
+        if name not in baseline:
+            print(f"{name:<28} {value * 1e6:>14.3f} us   (new)")
+            continue
+        ratio = value / baseline[name]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {value * 1e6:>14.3f} us   x{ratio:.2f}{flag}")
+    return regressions
+
+def save(results, path):
+    """Saves results as a JSON file.
+
+    Args:
+        results (dict): time per call of each benchmark, by name.
+        path (str): file to write.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results
+        }, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+def main():
+    """Runs the suite from the command line."""
+    parser = argparse.ArgumentParser(description="Calculator benchmarks.")
+    parser.add_argument("-k", "--pattern", help="only runs the matching benchmarks.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of measures.")
+    parser.add_argument("-o", "--output", help="file to save the results to.")
+    parser.add_argument("--compare", nargs="?", const=BASELINE,\
+        help="baseline to compare to. Defaults to benchmarks/baseline.json.")
+    parser.add_argument("--threshold", type=float, default=0.25,\
+        help="tolerated slowdown when comparing. Defaults to 0.25.")
+    parser.add_argument("--save-baseline", action="store_true",\
+        help="saves the results as the new baseline.")
+    args = parser.parse_args()
+    results = run(args.pattern, args.repeat)
+    if args.output:
+        save(results, args.output)
+    if args.save_baseline:
+        save(results, BASELINE)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        return
+    for name, value in results.items():
+        print(f"{name:<28} {value * 1e6:>14.3f} us")
+
+if __name__ == "__main__":
+    main()
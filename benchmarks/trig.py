@@ -0,0 +1,86 @@
+"""Compares the trig kernels of `equations.ft_maths` with the previous
+implementation, a 15-term Taylor series recomputing every power and
+factorial for every term.
+
+Run from the root of the repository:
+
+    python -m benchmarks.trig
+    python -m benchmarks.trig --points 1000 --range 100
+
+For each function, prints the time per call and the largest error
+against numpy, for the previous implementation and the current one."""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from equations.ft_maths import PI, ft_fact, ft_sin, ft_cos, ft_tan
+
+def previous_sin(x):
+    """sin(x), as computed before the precomputed kernels."""
+    if x == PI:
+        return 0
+    sin_x = 0
+    x = x % (2 * PI)
+    if x > PI:
+        x -= 2 * PI
+    for n in range(15):
+        sin_x += ((-1) ** n) * (x ** (2 * n + 1)) / ft_fact(2 * n + 1)
+    return sin_x
+
+def previous_cos(x):
+    """cos(x), as computed before the precomputed kernels."""
+    if x == PI:
+        return -1
+    return previous_sin((PI / 2) - x)
+
+def previous_tan(x):
+    """tan(x), as computed before the precomputed kernels."""
+    if x == PI:
+        return 0
+    return previous_sin(x) / previous_cos(x)
+
+FUNCTIONS = {
+    "sin": (previous_sin, ft_sin, np.sin),
+    "cos": (previous_cos, ft_cos, np.cos),
+    "tan": (previous_tan, ft_tan, np.tan),
+}
+
+def measure(function, points, reference, repeat = 3):
+    """Times a function over the points and finds its largest error.
+
+    Args:
+        function (callable): scalar function to measure.
+        points (list[float]): input values.
+        reference (ndarray): exact values at the points.
+        repeat (int, optionnal): number of measures. Defaults to 3.
+
+    Returns:
+        tuple: best time per call in seconds, and largest absolute error.
+    """
+    best = min(timeit.repeat(lambda: [function(x) for x in points], number=1, repeat=repeat))
+    error = np.max(np.abs(np.array([function(x) for x in points]) - reference))
+    return best / len(points), float(error)
+
+def main():
+    """Runs the comparison from the command line."""
+    parser = argparse.ArgumentParser(description="Trig kernels, previous / current.")
+    parser.add_argument("--points", type=int, default=10000, help="number of inputs.")
+    parser.add_argument("--range", type=float, default=10.0,\
+        help="inputs are drawn in [-range, range].")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="number of measures.")
+    args = parser.parse_args()
+    values = np.random.default_rng(0).uniform(-args.range, args.range, args.points)
+    points = [float(x) for x in values]
+    print(f"{'function':>8} {'previous (us)':>14} {'error':>9} {'current (us)':>13} "
+        f"{'error':>9} {'speedup':>8}")
+    for name, (previous, current, exact) in FUNCTIONS.items():
+        reference = exact(values)
+        old_time, old_error = measure(previous, points, reference, args.repeat)
+        new_time, new_error = measure(current, points, reference, args.repeat)
+        print(f"{name:>8} {old_time * 1e6:>14.3f} {old_error:>9.1e} {new_time * 1e6:>13.3f} "
+            f"{new_error:>9.1e} {old_time / new_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
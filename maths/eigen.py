@@ -0,0 +1,140 @@
+"""Eigenvalue engine, working on square 2D complex arrays.
+
+The matrix is first reduced to Hessenberg form with Householder
+reflections, then brought to its complex Schur form A = Q T Q* by
+shifted QR iterations (Wilkinson shifts, with deflation of the
+converged values). Working in complex arithmetic handles complex
+eigenvalues directly. The eigenvalues are the diagonal of T, and the
+eigenvectors come from back substitution on T. Each QR step costs
+O(n^2) on a Hessenberg matrix, so the whole solve is O(n^3)."""
+
+import numpy as np
+
+MAX_ITERATIONS = 30
+
+def hessenberg(array):
+    """Reduces a square array to Hessenberg form, A = Q H Q*.
+
+    Args:
+        array (ndarray): square 2D array. It isn't modified.
+
+    Returns:
+        tuple: H, and the unitary Q.
+    """
+    result = np.array(array, dtype=complex)
+    size = result.shape[0]
+    unitary = np.identity(size, dtype=complex)
+    for k in range(size - 2):
+        column = result[k + 1:, k]
+        norm = np.linalg.norm(column)
+        if norm == 0:
+            continue
+        phase = column[0] / abs(column[0]) if column[0] != 0 else 1
+        reflector = column.copy()
+        reflector[0] += phase * norm
+        reflector /= np.linalg.norm(reflector)
+        result[k + 1:, k:] -= 2 * np.outer(reflector, reflector.conj() @ result[k + 1:, k:])
+        result[:, k + 1:] -= 2 * np.outer(result[:, k + 1:] @ reflector, reflector.conj())
+        unitary[:, k + 1:] -= 2 * np.outer(unitary[:, k + 1:] @ reflector, reflector.conj())
+    return result, unitary
+
+def rotation(first, second):
+    """Returns the unitary 2x2 rotation G such that G [first, second] = [r, 0].
+
+    Args:
+        first (complex): first value.
+        second (complex): value to cancel.
+    """
+    norm = np.hypot(abs(first), abs(second))
+    if norm == 0:
+        return np.identity(2, dtype=complex)
+    return np.array([[first.conjugate(), second.conjugate()], [-second, first]]) / norm
+
+def shift(block):
+    """Returns the Wilkinson shift of a 2x2 block: its eigenvalue the \
+    closest to its last diagonal value."""
+    (a, b), (c, d) = block
+    half_trace = (a + d) / 2
+    root = np.sqrt(((a - d) / 2) ** 2 + b * c)
+    first, second = half_trace + root, half_trace - root
+    return first if abs(first - d) < abs(second - d) else second
+
+def schur(array):
+    """Computes the complex Schur form of a square array, A = Q T Q*.
+
+    Args:
+        array (ndarray): square 2D array. It isn't modified.
+
+    Raises:
+        ValueError: the iterations didn't converge.
+
+    Returns:
+        tuple: the upper triangular T, and the unitary Q.
+    """
+    result, unitary = hessenberg(array)
+    size = result.shape[0]
+    eps = np.finfo(float).eps
+    high = size - 1
+    iterations = 0
+    while high > 0:
+        low = high
+        while low > 0:
+            scale = abs(result[low - 1, low - 1]) + abs(result[low, low])
+            if abs(result[low, low - 1]) <= eps * (scale if scale != 0 else 1):
+                result[low, low - 1] = 0
+                break
+            low -= 1
+        if low == high:
+            high -= 1
+            iterations = 0
+            continue
+        iterations += 1
+        if iterations > MAX_ITERATIONS * size:
+            raise ValueError("The eigenvalues couldn't be computed !")
+        if iterations % 10 == 0:
+            mu = result[high, high] + abs(result[high, high - 1])
+        else:
+            mu = shift(result[high - 1:high + 1, high - 1:high + 1])
+        window = np.arange(low, high + 1)
+        result[window, window] -= mu
+        rotations = []
+        for k in range(low, high):
+            turn = rotation(result[k, k], result[k + 1, k])
+            result[k:k + 2, k:] = turn @ result[k:k + 2, k:]
+            rotations.append(turn.conj().T)
+        for k, turn in zip(range(low, high), rotations):
+            result[:k + 2, k:k + 2] = result[:k + 2, k:k + 2] @ turn
+            unitary[:, k:k + 2] = unitary[:, k:k + 2] @ turn
+        result[window, window] += mu
+    return np.triu(result), unitary
+
+def eigen(array):
+    """Computes the eigenvalues and eigenvectors of a square array, \
+    sorted by decreasing modulus.
+
+    Args:
+        array (ndarray): square 2D array. It isn't modified.
+
+    Raises:
+        ValueError: the iterations didn't converge.
+
+    Returns:
+        tuple: the eigenvalues, and the matching eigenvectors as the \
+        columns of an array, each of norm 1.
+    """
+    triangular, unitary = schur(array)
+    size = triangular.shape[0]
+    values = np.diag(triangular).copy()
+    smallest = np.finfo(float).eps * max(np.abs(triangular).max(initial=0), 1)
+    vectors = np.zeros((size, size), dtype=complex)
+    for k in range(size):
+        vectors[k, k] = 1
+        for i in range(k - 1, -1, -1):
+            difference = triangular[i, i] - values[k]
+            if abs(difference) < smallest:
+                difference = smallest
+            vectors[i, k] = -(triangular[i, i + 1:k + 1] @ vectors[i + 1:k + 1, k]) / difference
+    vectors = unitary @ vectors
+    vectors /= np.linalg.norm(vectors, axis=0)
+    order = np.argsort(-np.abs(values), kind="stable")
+    return values[order], vectors[:, order]
@@ -0,0 +1,130 @@
+"""Lazy element-wise matrix expressions.
+
+Adding, substracting, moduling or scaling a `LazyMatrix` doesn't compute
+anything: it records the operation. `evaluate` then computes the whole
+expression in a single pass over the lines of the result, a block of
+lines at a time, so that the intermediate values only ever hold one
+block instead of a full matrix per operation."""
+
+import numpy as np
+
+from maths.complex import Complex
+from maths.matrix import Matrix
+
+BLOCK_SIZE = 1 << 14
+
+class LazyMatrix():
+    """Element-wise expression of matrices, evaluated on demand.
+
+    Args:
+        operation (str): `leaf`, `+`, `-`, `%` or `scale`.
+        operands (tuple): the Matrix for a leaf, the two LazyMatrix for \
+        `+`, `-` and `%`, or the LazyMatrix and the complex factor for \
+        `scale`.
+        shape (tuple): number of lines and columns of the result.
+    """
+    def __init__(self, operation, operands, shape):
+        self._operation = operation
+        self._operands = operands
+        self._shape = shape
+
+    @staticmethod
+    def wrap(value):
+        """Wraps a Matrix in a lazy expression. Other values are returned \
+        as they are."""
+        if isinstance(value, Matrix):
+            return LazyMatrix("leaf", (value,), (value.lines, value.columns))
+        return value
+
+    def __add__(self, other):
+        """+ operator overload.
+
+        Raises:
+            AttributeError : An attempt to add a matrix with anything else was made.
+            AttributeError : An attempt to add two matrices of different sizes was made.
+        """
+        if not isinstance(other, LazyMatrix):
+            raise AttributeError("You can only add a Matrix to another one !")
+        if self._shape != other._shape:
+            raise AttributeError("Two matrices needs the same amount of values to be added !")
+        return LazyMatrix("+", (self, other), self._shape)
+
+    def __sub__(self, other):
+        """- operator overload.
+
+        Raises:
+            AttributeError : An attempt to substract a matrix with anything else was made.
+            AttributeError : An attempt to substract two matrices of different sizes was made.
+        """
+        if not isinstance(other, LazyMatrix):
+            raise AttributeError("You can only substract a Matrix to another one !")
+        if self._shape != other._shape:
+            raise AttributeError("Two matrices needs the same amount of values to be substracted !")
+        return LazyMatrix("-", (self, other), self._shape)
+
+    def __mul__(self, other):
+        """* operator overload. Scaling stays lazy, but the product of two \
+        matrices is computed right away."""
+        if isinstance(other, (int, float, Complex)):
+            return LazyMatrix("scale", (self, complex(other)), self._shape)
+        if isinstance(other, LazyMatrix):
+            return LazyMatrix.wrap(self.evaluate() * other.evaluate())
+        return self.evaluate() * other
+
+    def __mod__(self, other):
+        """% operator overload.
+
+        Raises:
+            AttributeError : An attempt to mod a matrix with anything else was made.
+            AttributeError : An attempt to mod two matrices of different sizes was made.
+        """
+        if not isinstance(other, LazyMatrix):
+            raise AttributeError("You can only modulo a Matrix to another one !")
+        if self._shape != other._shape:
+            raise AttributeError("Two matrices needs the same amount of values to be moduled !")
+        return LazyMatrix("%", (self, other), self._shape)
+
+    def evaluate(self):
+        """Computes the expression, a block of lines at a time.
+
+        Returns:
+            Matrix: the result.
+        """
+        if self._operation == "leaf":
+            return self._operands[0]
+        lines, columns = self._shape
+        result = np.empty(self._shape, dtype=complex)
+        step = max(BLOCK_SIZE // max(columns, 1), 1)
+        for start in range(0, lines, step):
+            rows = slice(start, min(start + step, lines))
+            result[rows] = self.__block(rows)
+        return Matrix(result, False)
+
+    def __block(self, rows):
+        """Computes the given lines of the expression."""
+        operation, operands = self._operation, self._operands
+        if operation == "leaf":
+            return operands[0].block(rows.start, rows.stop)
+        if operation == "scale":
+            block = operands[0].__block(rows)
+            if operands[0]._operation == "leaf":
+                return block * operands[1]
+            block *= operands[1]
+            return block
+        left = operands[0].__block(rows)
+        right = operands[1].__block(rows)
+        if operation == "%":
+            divisor = right.real
+            return np.mod(left.real, divisor) + 1j * np.mod(left.imag, divisor)
+        if operands[0]._operation == "leaf":
+            return left + right if operation == "+" else left - right
+        if operation == "+":
+            left += right
+        else:
+            left -= right
+        return left
+
+    @property
+    def shape(self):
+        """Returns the number of lines and columns of the result."""
+        return self._shape
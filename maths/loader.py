@@ -0,0 +1,144 @@
+"""Bulk matrix loading, from matrix tokens, CSV files and binary files.
+
+The values are parsed in a single pass over the whole text, rather than
+one `Complex` at a time: real values go through numpy's C parser, and
+only inputs holding complex values fall back to a string conversion.
+Binary files (`.npy`, or raw values of a given type) are memory-mapped,
+so the values are only read from the disk when they are used. Matrices
+keep mapped values in their own type, and only convert the lines an
+operation reads: element-wise expressions (see `maths.lazy`) go through
+the file a block of lines at a time, while products, powers, inverses
+and the like need a complex copy of the whole matrix for the operation."""
+
+import re
+import warnings
+
+import numpy as np
+
+IMAGINARY = re.compile(r"(?<![\d.])i")
+
+def parse_numbers(text, count):
+    """Parses `count` values separated by commas.
+
+    Args:
+        text (str): the values, ie `1,-2.5,3+2i`.
+        count (int): number of values expected.
+
+    Raises:
+        ValueError: a value couldn't be read.
+
+    Returns:
+        ndarray: 1D array of the values, real if possible, complex otherwise.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=float, sep=",")
+        except (ValueError, DeprecationWarning):
+            values = None
+    if values is not None and values.size == count:
+        return values
+    values = IMAGINARY.sub("1i", text).replace("i", "j").split(",")
+    if len(values) != count:
+        raise ValueError(f"Expected {count} values, got {len(values)} !")
+    try:
+        return np.array([value.strip() for value in values]).astype(complex)
+    except ValueError as e:
+        raise ValueError(f"Cannot read the values of the matrix : {e}") from e
+
+def parse_table(rows):
+    """Parses lines of values separated by commas.
+
+    Args:
+        rows (list[str]): the lines.
+
+    Raises:
+        AttributeError: the lines don't have the same amount of values.
+        ValueError: a value couldn't be read.
+
+    Returns:
+        ndarray: 2D array of the values.
+    """
+    counts = {row.count(",") for row in rows}
+    if len(counts) != 1:
+        raise AttributeError("A matrix needs the same amount of values on all lines !")
+    columns = counts.pop() + 1
+    return parse_numbers(",".join(rows), len(rows) * columns).reshape(len(rows), columns)
+
+def parse_literal(value):
+    """Parses a matrix token, ie `[[1,2];[3,-4i]]`.
+
+    Raises:
+        AttributeError: the lines don't have the same amount of values.
+        ValueError: a value couldn't be read.
+
+    Returns:
+        ndarray: 2D array of the values.
+    """
+    return parse_table(value[2:-2].split("];["))
+
+def load_csv(path):
+    """Loads a CSV file of values separated by commas, one line of the \
+    matrix per line of the file. Blank lines are ignored.
+
+    Returns:
+        ndarray: 2D array of the values.
+    """
+    with open(path, encoding="utf-8") as file:
+        rows = [row for row in file.read().splitlines() if row.strip()]
+    if not rows:
+        raise ValueError(f"{path} holds no values !")
+    return parse_table(rows)
+
+def load_binary(path, columns = None, dtype = "float64"):
+    """Memory-maps a `.npy` file, or a raw binary file of values.
+
+    Args:
+        path (str): the file.
+        columns (int, optionnal): number of columns. Required for a raw \
+        file, and used to reshape a 1D `.npy` file.
+        dtype (str, optionnal): type of the values of a raw file. \
+        Defaults to `float64`.
+
+    Raises:
+        ValueError: the values can't be shaped as a matrix.
+
+    Returns:
+        ndarray: read-only 2D array, mapped on the file.
+    """
+    if path.lower().endswith(".npy"):
+        values = np.load(path, mmap_mode="r")
+    else:
+        if columns is None:
+            raise ValueError("The number of columns of a raw binary file is needed !")
+        values = np.memmap(path, dtype=np.dtype(dtype), mode="r")
+    if columns is not None:
+        if columns <= 0 or values.size % columns:
+            raise ValueError(f"{values.size} values can't be split in {columns} columns !")
+        values = values.reshape(-1, columns)
+    if values.ndim != 2:
+        raise ValueError("A matrix file needs 2 dimensions !")
+    return values
+
+def load(path, columns = None, dtype = "float64"):
+    """Loads the values of a matrix from a file, according to its \
+    extension: `.csv` and `.txt` are parsed as CSV, others are binary.
+
+    Args:
+        path (str): the file.
+        columns (int, optionnal): number of columns of a binary file.
+        dtype (str, optionnal): type of the values of a raw binary file. \
+        Defaults to `float64`.
+
+    Raises:
+        ValueError: the file couldn't be read.
+
+    Returns:
+        ndarray: 2D array of the values.
+    """
+    try:
+        if path.lower().endswith((".csv", ".txt")):
+            return load_csv(path)
+        return load_binary(path, columns, dtype)
+    except (OSError, TypeError) as e:
+        raise ValueError(f"Cannot load {path} : {e}") from e
@@ -0,0 +1,78 @@
+"""LU decomposition engine, working on square 2D complex arrays.
+
+A matrix A is factored once as P A = L U, with partial pivoting. L and U
+are stored together in a single array: U on and above the diagonal, L
+below it (its diagonal is all 1s and isn't stored). The determinant,
+the inverse and the linear solves are then built on top of the factors."""
+
+import numpy as np
+
+def factor(array):
+    """Factors a square array with partial pivoting, in O(n^3).
+
+    Args:
+        array (ndarray): square 2D array. It isn't modified.
+
+    Returns:
+        tuple: the combined L and U factors, the permutation of the \
+        lines as an array of indexes, the sign of the permutation, and \
+        whether or not the array is singular.
+    """
+    factors = np.array(array, dtype=complex)
+    size = factors.shape[0]
+    permutation = np.arange(size)
+    sign = 1
+    singular = False
+    #a pivot is compared with the largest value of its line in the array, so
+    #that badly scaled but well conditioned matrices aren't seen as singular
+    tolerances = size * np.finfo(float).eps * np.abs(factors).max(axis=1, initial=0)
+    for k in range(size):
+        pivot = k + int(np.argmax(np.abs(factors[k:, k])))
+        if pivot != k:
+            factors[[k, pivot]] = factors[[pivot, k]]
+            permutation[[k, pivot]] = permutation[[pivot, k]]
+            sign = -sign
+        if abs(factors[k, k]) <= tolerances[permutation[k]]:
+            singular = True
+            continue
+        factors[k + 1:, k] /= factors[k, k]
+        factors[k + 1:, k + 1:] -= np.outer(factors[k + 1:, k], factors[k, k + 1:])
+    return factors, permutation, sign, singular
+
+def determinant(decomposition):
+    """Computes the determinant from the factors, as the product of the \
+    pivots. It is only 0 when a pivot is exactly 0.
+
+    Args:
+        decomposition (tuple): result of `factor`.
+
+    Returns:
+        complex: the determinant.
+    """
+    factors, _, sign, _ = decomposition
+    return sign * complex(np.prod(np.diag(factors)))
+
+def solve(decomposition, values):
+    """Solves A X = B from the factors of A, in O(n^2) per column of B.
+
+    Args:
+        decomposition (tuple): result of `factor`.
+        values (ndarray): B, as a 2D array with as many lines as A.
+
+    Raises:
+        ValueError: A is singular.
+
+    Returns:
+        ndarray: X, with the shape of B.
+    """
+    factors, permutation, _, singular = decomposition
+    if singular:
+        raise ValueError("The matrix is singular !")
+    result = np.array(values, dtype=complex)[permutation]
+    size = factors.shape[0]
+    for i in range(1, size):
+        result[i] -= factors[i, :i] @ result[:i]
+    for i in range(size - 1, -1, -1):
+        result[i] -= factors[i, i + 1:] @ result[i + 1:]
+        result[i] /= factors[i, i]
+    return result
@@ -1,13 +1,32 @@
 """Class for storing matrixes."""
 
+import numpy as np
+
 from maths.complex import Complex
+from maths import lu, sparse, loader
+from maths.eigen import eigen
+
+# Off by default: the cache keeps about log2(n) full squares on the matrix.
+CACHE_POWERS = False
+
+def promoted(storage):
+    """Returns the storage of a matrix as the kernels expect it: a CSR, \
+    or a 2D complex array. Values mapped on a file in another type are \
+    converted here, for the current operation only."""
+    if isinstance(storage, np.ndarray) and storage.dtype != complex:
+        return storage.astype(complex)
+    return storage
 
 class Matrix():
-    """Creates a Matrix.
-    
+    """Creates a Matrix. The values are stored in a contiguous complex array, \
+    or as a `maths.sparse.CSR` when most of them are zeros. The representation \
+    is picked automatically, and both can be mixed in the operators. Values \
+    memory-mapped on a file (see `maths.loader`) are kept mapped, in their \
+    own type: they are only read and converted by the operations using them.
+
     Args:
-        values (str | list[list]): List of values to insert. Can be a token \
-        or an actual matrix represented as a list of list.
+        values (str | list[list] | ndarray): List of values to insert. Can be a token, \
+        an actual matrix represented as a list of list, or a 2D array.
         read_from_tokens (bool, optionnal): Wether or not `values` if a token. Defaults to \
         `True`.
 
@@ -15,61 +34,54 @@ class Matrix():
         AttributeError : The matrix's lines lengths are mistmatched. \
     """
     def __init__(self, values, read_from_tokens = True):
+        self._squares = None
+        self._lu = None
+        self._eigen = None
+        self.cache_powers = CACHE_POWERS
         if read_from_tokens:
-            self._values = [[]]
+            self._storage = np.zeros((1, 0), dtype=complex)
             self.read(values)
         else:
-            self._values = values
-        self._lines = len(self._values)
-        self._columns = len(self._values[0])
-        for data in self._values:
-            if len(data) != self._columns:
-                raise AttributeError("A matrix needs the same amount of values on all lines !")
+            self.values = values
+        self._lines, self._columns = self._storage.shape
 
     def __str__(self):
         result = ""
-        for data in self._values:
+        for data in self.array:
             result += "["
-            for i, _ in enumerate(data):
-                if i + 1 >= len(data):
-                    result += f"{data[i]}"
-                else:
-                    result += f"{data[i]}, "
+            result += ", ".join(str(Complex(float(value.real), float(value.imag)))\
+                for value in data)
             result += "]\n"
         return result.strip()
 
     def read(self, value):
-        """Reads a token and stores its values in the matrix.
-        
+        """Reads a token and stores its values in the matrix. All the \
+        values are parsed at once, see `maths.loader.parse_literal`.
+
         Args:
             value (string): Token to parse.
+
+        Raises:
+            AttributeError : The matrix's lines lengths are mistmatched.
+            ValueError : A value couldn't be read.
         """
         if value is None:
             return
-        rows = value[2:-2].split("];[")
-        self._values = [
-            [Complex(0, 0).from_string(num) for num in row.split(',')]
-            for row in rows
-        ]
+        self.values = loader.parse_literal(value)
 
     def identity_matrix(self, n):
         """Creates and returns an identity matrix of size n as a double list.
         An identity matrix of a matrix made of 0 and 1, only on the diagonal, eg : \n
-        1 0 0 0 \n 
+        1 0 0 0 \n
         0 1 0 0 \n
         0 0 1 0 \n
         0 0 0 1
         """
-        matrix = self.__generate_empty_matrix(n, n)
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    matrix[i][j] = 1
-        return matrix
+        return np.identity(n, dtype=int).tolist()
 
     def __add__(self, other):
         """+ operator overload.
-        
+
         Raises:
             AttributeError : An attempt to add a matrix with anything else was made.
             AttributeError : An attempt to add two matrices of different sizes was made.
@@ -78,12 +90,11 @@ class Matrix():
             raise AttributeError("You can only add a Matrix to another one !")
         if self._lines != other._lines or self._columns != other._columns:
             raise AttributeError("Two matrices needs the same amount of values to be added !")
-        return Matrix([[self._values[i][j] + other.values[i][j]\
-            for j in range(len(self._values[0]))] for i in range(len(self._values))], False)
+        return Matrix(sparse.add(promoted(self._storage), promoted(other._storage)), False)
 
     def __sub__(self, other):
         """- operator overload.
-        
+
         Raises:
             AttributeError : An attempt to substract a matrix with anything else was made.
             AttributeError : An attempt to substract two matrices of different sizes was made.
@@ -92,47 +103,25 @@ class Matrix():
             raise AttributeError("You can only substract a Matrix to another one !")
         if self._lines != other._lines or self._columns != other._columns:
             raise AttributeError("Two matrices needs the same amount of values to be substracted !")
-        return Matrix([[self._values[i][j] - other.values[i][j]\
-            for j in range(len(self._values[0]))] for i in range(len(self._values))], False)
-
-    def __generate_empty_matrix(self, cols, lines):
-        """Generates a matrix of size cols*line filled with 0s.
-        
-        Args:
-            cols (int): Numbers of values per line.
-            lines (int): Numbers of lines.
-            
-        Returns:
-            list[list]: An empty matrix as a list."""
-        reference = []
-        matrix = []
-        for _ in range(cols):
-            reference.append(0)
-        for _ in range(lines):
-            matrix.append(reference.copy())
-        return matrix
+        return Matrix(sparse.add(promoted(self._storage), promoted(other._storage), -1), False)
 
     def __mul__(self, other):
         """Makes a simple multiplication between two matrices or between a matrix
         and a scalar."""
         if isinstance(other, (int, float, Complex)):
-            return Matrix([[val * other for val in row] for row in self._values], False)
+            return Matrix(sparse.scale(promoted(self._storage), complex(other)), False)
         if not isinstance(other, Matrix):
             raise AttributeError\
                 ("You can only (simple) multiply a matrix with a scalar or another matrix !")
         if self._columns != other._lines:
             raise AttributeError\
                 ("Two matrices needs the same amount of values to be (simple) multiplied !")
-        new_values = self.__generate_empty_matrix(other.columns, self._lines)
-        for line in range(self._lines):
-            for col in range(other.columns):
-                for i in range(self._columns):
-                    new_values[line][col] += self._values[line][i] * other.values[i][col]
-        return Matrix(new_values, False)
+        return Matrix(sparse.product(promoted(self._storage), promoted(other._storage)), False)
 
     def __mod__(self, other):
-        """% operator overload.
-        
+        """% operator overload. Each value is moduled by the real part of the
+        matching value of the other matrix, like `Complex.__mod__` does.
+
         Raises:
             AttributeError : An attempt to mod a matrix with anything else was made.
             AttributeError : An attempt to mod two matrices of different sizes was made.
@@ -141,22 +130,51 @@ class Matrix():
             raise AttributeError("You can only modulo a Matrix to another one !")
         if self._lines != other._lines or self._columns != other._columns:
             raise AttributeError("Two matrices needs the same amount of values to be moduled !")
-        return Matrix([[val % other for val in row] for row in self._values], False)
+        array, divisor = self.array, other.array.real
+        return Matrix(np.mod(array.real, divisor) + 1j * np.mod(array.imag, divisor), False)
 
     def __pow__(self, other):
-        """^ operator overload.
-        
+        """^ operator overload. Computed by squaring, in O(log n) \
+        multiplications. The exponent can be an int, or a Complex \
+        holding an integer. If `cache_powers` is set, the successive \
+        squares are kept on the matrix for the next powers.
+
         Raises:
             AttributeError : An attempt to raise a matrix with anything else than an int.
             AttributeError : An attempt to raise a non square matrix was made."""
-        if isinstance(other, int):
-            if self._lines != self._columns:
-                raise AttributeError("You can only raise a square matrix to a power !")
-            result = self
-            for _ in range(other - 1):
-                result = result * self
-            return result
-        raise AttributeError("You can only power a Matrix with a positive integer !")
+        if isinstance(other, Complex) and other.imag == 0:
+            other = other.real
+        if isinstance(other, float) and other.is_integer():
+            other = int(other)
+        if not isinstance(other, int) or isinstance(other, bool) or other < 0:
+            raise AttributeError("You can only power a Matrix with a positive integer !")
+        if self._lines != self._columns:
+            raise AttributeError("You can only raise a square matrix to a power !")
+        if other == 0:
+            return Matrix(np.identity(self._lines, dtype=complex), False)
+        result = None
+        square = promoted(self._storage)
+        for bit in range(other.bit_length()):
+            if bit > 0:
+                square = self.__square(bit, square)
+            if other >> bit & 1:
+                result = square if result is None else sparse.product(result, square)
+        return Matrix(result, False)
+
+    def __square(self, bit, previous):
+        """Returns the matrix raised to the power 2^bit, from the previous \
+        square. Uses and fills the cache of squares if `cache_powers` is set.
+
+        Args:
+            bit (int): index of the square.
+            previous (ndarray | CSR): matrix raised to the power 2^(bit - 1)."""
+        if not self.cache_powers:
+            return sparse.product(previous, previous)
+        if self._squares is None:
+            self._squares = [previous]
+        if bit >= len(self._squares):
+            self._squares.append(sparse.product(previous, previous))
+        return self._squares[bit]
 
     def __matmul__(self, other):
         """@ operator overload. Multiplication of two matrices.
@@ -171,43 +189,152 @@ class Matrix():
             raise AttributeError\
                 ("To multiply two matrices, the first one needs" +\
                 "to have as many columns as the second one has lines !")
-        matr = self.__generate_empty_matrix(self._columns, other._lines)
-        for row in range(other._lines):
-            for column in range(self._columns):
-                for value, _ in enumerate(other.values):
-                    matr[row][column] += self._values[row][value] * other.values[value][column]
-        return Matrix(matr, False)
+        return Matrix(sparse.product(promoted(self._storage), promoted(other._storage)), False)
+
+    def lu(self):
+        """Returns the LU decomposition of the matrix, with partial pivoting. \
+        It is computed on the first call, then kept on the matrix.
+
+        Raises:
+            AttributeError : The matrix isn't square.
+
+        Returns:
+            tuple : decomposition, as given by `maths.lu.factor`.
+        """
+        if self._lines != self._columns:
+            raise AttributeError("Only a square matrix can be decomposed !")
+        if self._lu is None:
+            self._lu = lu.factor(self.array)
+        return self._lu
+
+    def det(self):
+        """Returns the determinant of the matrix.
+
+        Raises:
+            AttributeError : The matrix isn't square.
+        """
+        value = lu.determinant(self.lu())
+        return Complex(value.real, value.imag)
+
+    def inv(self):
+        """Returns the inverse of the matrix.
+
+        Raises:
+            AttributeError : The matrix isn't square.
+            ValueError : The matrix is singular.
+        """
+        return Matrix(lu.solve(self.lu(), np.identity(self._lines, dtype=complex)), False)
+
+    def solve(self, other):
+        """Solves the linear system A X = B, A being the matrix.
+
+        Args:
+            other (Matrix): B, with as many lines as the matrix.
+
+        Raises:
+            AttributeError : The matrix isn't square, or B doesn't fit.
+            ValueError : The matrix is singular.
+
+        Returns:
+            Matrix : X, with the size of B.
+        """
+        if not isinstance(other, Matrix) or other.lines != self._lines:
+            raise AttributeError("The values to solve for need as many lines as the matrix !")
+        return Matrix(lu.solve(self.lu(), other.array), False)
+
+    def eigen(self):
+        """Returns the eigenvalues and eigenvectors of the matrix, sorted by \
+        decreasing modulus. They are computed on the first call, then kept \
+        on the matrix.
+
+        Raises:
+            AttributeError : The matrix isn't square.
+            ValueError : The computation didn't converge.
+
+        Returns:
+            tuple : eigenvalues and eigenvectors, as given by `maths.eigen.eigen`.
+        """
+        if self._lines != self._columns:
+            raise AttributeError("Only a square matrix has eigenvalues !")
+        if self._eigen is None:
+            self._eigen = eigen(self.array)
+        return self._eigen
+
+    def eigenvalues(self):
+        """Returns the eigenvalues of the matrix as a list of Complex, sorted \
+        by decreasing modulus."""
+        return [Complex(float(value.real), float(value.imag)) for value in self.eigen()[0]]
+
+    def eigenvectors(self):
+        """Returns the eigenvectors of the matrix, as the columns of a \
+        matrix. They match the order of `eigenvalues`."""
+        return Matrix(self.eigen()[1], False)
 
     def __eq__(self, other):
         """Equality operator overload =="""
         if not isinstance(other, Matrix):
             return False
-        if self._columns != other._columns or self._lines != other.lines:
-            return False
-        for i in range(self._columns):
-            for j in range(self._lines):
-                if self._values[i][j] != other._values[i][j]:
-                    return False
-        return True
+        return np.array_equal(self.array, other.array)
 
     def __ne__(self, other):
         """Inquality operator overload !="""
-        if not isinstance(other, Matrix):
-            return True
-        if self._columns != other._columns or self._lines != other.lines:
-            return True
-        if self == other:
-            return False
-        return True
+        return not self == other
+
+    def block(self, start, stop):
+        """Returns the lines from `start` to `stop` (excluded) as a dense \
+        2D complex array, without expanding the rest of a sparse matrix, \
+        nor reading the rest of a mapped one."""
+        if isinstance(self._storage, sparse.CSR):
+            return sparse.expand(self._storage, start, stop)
+        return np.asarray(self._storage[start:stop], dtype=complex)
+
+    @property
+    def array(self):
+        """Returns the matrix as a 2D complex array. The array is shared \
+        with the matrix, unless the matrix is sparse, or mapped in \
+        another type than complex128."""
+        if isinstance(self._storage, sparse.CSR):
+            return sparse.expand(self._storage)
+        return promoted(self._storage)
+
+    @property
+    def is_mapped(self):
+        """Returns whether or not the values are mapped on a file."""
+        return isinstance(self._storage, np.memmap)
+
+    @property
+    def is_sparse(self):
+        """Returns whether or not the matrix is stored as a CSR."""
+        return isinstance(self._storage, sparse.CSR)
 
     @property
     def values(self):
         """Returns the matrix as a list."""
-        return self._values
+        return [[Complex(float(value.real), float(value.imag)) for value in row]\
+            for row in self.array]
 
     @values.setter
     def values(self, value):
-        self._values = value
+        self._squares = None
+        self._lu = None
+        self._eigen = None
+        if isinstance(value, np.memmap) and value.ndim == 2 and value.dtype.kind in "biufc":
+            #kept as is: converting or checking the density would read the whole file
+            self._storage = value
+            self._lines, self._columns = value.shape
+            return
+        if not isinstance(value, (np.ndarray, sparse.CSR)):
+            columns = len(value[0])
+            for data in value:
+                if len(data) != columns:
+                    raise AttributeError("A matrix needs the same amount of values on all lines !")
+            value = [[complex(data) for data in row] for row in value]
+        if not isinstance(value, sparse.CSR):
+            value = np.asarray(value, dtype=complex)
+            if value.ndim != 2:
+                raise AttributeError("A matrix needs the same amount of values on all lines !")
+        self._storage = sparse.choose(value)
+        self._lines, self._columns = self._storage.shape
 
     @property
     def lines(self):
@@ -0,0 +1,88 @@
+"""Matrix multiplication engine, working on 2D complex arrays.
+
+Small products go straight to `numpy.matmul`, whose BLAS kernels are
+already tiled for the cache. Above `STRASSEN_THRESHOLD`, the product is
+split in 2x2 blocks and computed with Strassen's 7 products instead of
+8, recursively, until the blocks are small enough for BLAS again. Run
+`python -m benchmarks.crossover` to find the best threshold for a machine."""
+
+import numpy as np
+
+STRASSEN_THRESHOLD = 4096
+
+def matmul(left, right, threshold = None):
+    """Multiplies two arrays of compatible shapes.
+
+    Args:
+        left (ndarray): 2D array of shape (m, k).
+        right (ndarray): 2D array of shape (k, n).
+        threshold (int, optionnal): smallest dimension from which \
+        Strassen's algorithm is used. Defaults to `STRASSEN_THRESHOLD`.
+
+    Raises:
+        ValueError: the shapes are incompatible.
+
+    Returns:
+        ndarray: the (m, n) product.
+    """
+    if left.shape[1] != right.shape[0]:
+        raise ValueError(f"Cannot multiply shapes {left.shape} and {right.shape} !")
+    if threshold is None:
+        threshold = STRASSEN_THRESHOLD
+    if min(left.shape[0], left.shape[1], right.shape[1]) < threshold:
+        return left @ right
+    return strassen(left, right, threshold)
+
+def strassen(left, right, threshold):
+    """Multiplies two arrays with one level of Strassen's algorithm, the \
+    7 block products going back through `matmul`. Odd dimensions are \
+    padded with zeros.
+
+    Args:
+        left (ndarray): 2D array of shape (m, k).
+        right (ndarray): 2D array of shape (k, n).
+        threshold (int): smallest dimension from which Strassen's \
+        algorithm is used.
+
+    Returns:
+        ndarray: the (m, n) product.
+    """
+    lines, inner = left.shape
+    columns = right.shape[1]
+    half_lines, half_inner, half_columns = (lines + 1) // 2, (inner + 1) // 2, (columns + 1) // 2
+    if lines % 2 or inner % 2:
+        left = pad(left, 2 * half_lines, 2 * half_inner)
+    if inner % 2 or columns % 2:
+        right = pad(right, 2 * half_inner, 2 * half_columns)
+    a11, a12 = left[:half_lines, :half_inner], left[:half_lines, half_inner:]
+    a21, a22 = left[half_lines:, :half_inner], left[half_lines:, half_inner:]
+    b11, b12 = right[:half_inner, :half_columns], right[:half_inner, half_columns:]
+    b21, b22 = right[half_inner:, :half_columns], right[half_inner:, half_columns:]
+    m1 = matmul(a11 + a22, b11 + b22, threshold)
+    m2 = matmul(a21 + a22, b11, threshold)
+    m3 = matmul(a11, b12 - b22, threshold)
+    m4 = matmul(a22, b21 - b11, threshold)
+    m5 = matmul(a11 + a12, b22, threshold)
+    m6 = matmul(a21 - a11, b11 + b12, threshold)
+    m7 = matmul(a12 - a22, b21 + b22, threshold)
+    result = np.empty((2 * half_lines, 2 * half_columns), dtype=np.result_type(left, right))
+    result[:half_lines, :half_columns] = m1 + m4 - m5 + m7
+    result[:half_lines, half_columns:] = m3 + m5
+    result[half_lines:, :half_columns] = m2 + m4
+    result[half_lines:, half_columns:] = m1 - m2 + m3 + m6
+    return result[:lines, :columns]
+
+def pad(array, lines, columns):
+    """Pads an array with zeros, on the bottom and on the right.
+
+    Args:
+        array (ndarray): 2D array to pad.
+        lines (int): number of lines of the result.
+        columns (int): number of columns of the result.
+
+    Returns:
+        ndarray: the padded array.
+    """
+    result = np.zeros((lines, columns), dtype=array.dtype)
+    result[:array.shape[0], :array.shape[1]] = array
+    return result
@@ -0,0 +1,179 @@
+"""Sparse matrix engine, in compressed sparse row (CSR) form.
+
+A CSR matrix only keeps its non-zero values: `data` holds them line by
+line, `indices` their columns, and the values of line i are found
+between `indptr[i]` and `indptr[i + 1]`. The kernels below work on
+either a CSR or a dense 2D complex array, so that sparse and dense
+matrices can be mixed freely, and cost time and memory in proportion
+to the non-zero values they touch. `choose` picks the representation
+of a result: a CSR when at most `SPARSE_DENSITY` of its values aren't
+zero, and a dense array otherwise, or when it has less than
+`SPARSE_MIN_SIZE` values."""
+
+from collections import namedtuple
+
+import numpy as np
+
+from maths.multiply import matmul
+
+SPARSE_DENSITY = 0.05
+SPARSE_MIN_SIZE = 64
+
+CSR = namedtuple("CSR", ["data", "indices", "indptr", "shape"])
+
+def choose(value):
+    """Returns the best representation of a matrix for its density.
+
+    Args:
+        value (ndarray | CSR): the matrix.
+
+    Returns:
+        ndarray | CSR: the same matrix, as a CSR or as a dense array.
+    """
+    lines, columns = value.shape
+    size = lines * columns
+    if isinstance(value, CSR):
+        if size < SPARSE_MIN_SIZE or len(value.data) > SPARSE_DENSITY * size:
+            return expand(value)
+        return value
+    if size < SPARSE_MIN_SIZE or np.count_nonzero(value) > SPARSE_DENSITY * size:
+        return value
+    return compress(value)
+
+def compress(array):
+    """Converts a dense 2D array to a CSR."""
+    rows, columns = np.nonzero(array)
+    return CSR(array[rows, columns], columns, pointers(rows, array.shape[0]), array.shape)
+
+def expand(value, start = 0, stop = None):
+    """Converts some lines of a CSR to a dense array.
+
+    Args:
+        value (CSR): the matrix.
+        start (int, optionnal): first line. Defaults to 0.
+        stop (int, optionnal): line after the last one. Defaults to all \
+        the lines.
+
+    Returns:
+        ndarray: the lines, as a dense 2D array.
+    """
+    if stop is None:
+        stop = value.shape[0]
+    result = np.zeros((stop - start, value.shape[1]), dtype=complex)
+    first, last = value.indptr[start], value.indptr[stop]
+    rows = np.repeat(np.arange(stop - start), np.diff(value.indptr[start:stop + 1]))
+    result[rows, value.indices[first:last]] = value.data[first:last]
+    return result
+
+def pointers(rows, lines):
+    """Builds the `indptr` of a CSR from the sorted lines of its values."""
+    result = np.zeros(lines + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=lines), out=result[1:])
+    return result
+
+def lines_of(value):
+    """Returns the line of each value of a CSR."""
+    return np.repeat(np.arange(value.shape[0]), np.diff(value.indptr))
+
+def assemble(rows, columns, data, shape):
+    """Builds a CSR from values in any order. Values at the same place \
+    are summed, and the ones summing to zero are dropped.
+
+    Args:
+        rows (ndarray): line of each value.
+        columns (ndarray): column of each value.
+        data (ndarray): the values.
+        shape (tuple): number of lines and columns.
+
+    Returns:
+        CSR: the matrix.
+    """
+    if len(data) == 0:
+        return CSR(np.zeros(0, dtype=complex), np.zeros(0, dtype=np.intp),\
+            np.zeros(shape[0] + 1, dtype=np.intp), shape)
+    keys = rows * shape[1] + columns
+    order = np.argsort(keys, kind="stable")
+    keys, data = keys[order], data[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    keys, data = keys[starts], np.add.reduceat(data, starts)
+    kept = data != 0
+    rows, columns = np.divmod(keys[kept], shape[1])
+    return CSR(data[kept], columns, pointers(rows, shape[0]), shape)
+
+def transpose(value):
+    """Returns the transpose of a CSR."""
+    return assemble(value.indices, lines_of(value), value.data, value.shape[::-1])
+
+def add(left, right, sign = 1):
+    """Adds (or substracts) two matrices of the same shape.
+
+    Args:
+        left (ndarray | CSR): first matrix.
+        right (ndarray | CSR): second matrix.
+        sign (int, optionnal): 1 to add, -1 to substract. Defaults to 1.
+
+    Returns:
+        ndarray | CSR: the result, sparse when both matrices are.
+    """
+    left_sparse, right_sparse = isinstance(left, CSR), isinstance(right, CSR)
+    if not left_sparse and not right_sparse:
+        return left + right if sign == 1 else left - right
+    if left_sparse and right_sparse:
+        return assemble(np.concatenate((lines_of(left), lines_of(right))),\
+            np.concatenate((left.indices, right.indices)),\
+            np.concatenate((left.data, sign * right.data)), left.shape)
+    if left_sparse:
+        result = sign * right
+        result[lines_of(left), left.indices] += left.data
+        return result
+    result = np.array(left, dtype=complex)
+    result[lines_of(right), right.indices] += sign * right.data
+    return result
+
+def scale(value, factor):
+    """Multiplies a matrix by a scalar.
+
+    Args:
+        value (ndarray | CSR): the matrix.
+        factor (complex): the scalar.
+
+    Returns:
+        ndarray | CSR: the result, in the representation of the matrix.
+    """
+    if not isinstance(value, CSR):
+        return value * factor
+    if factor == 0:
+        return assemble(np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp),\
+            np.zeros(0, dtype=complex), value.shape)
+    return CSR(value.data * factor, value.indices, value.indptr, value.shape)
+
+def product(left, right):
+    """Multiplies two matrices of compatible shapes. Dense products go \
+    through `maths.multiply.matmul`. A sparse product only computes the \
+    products of non-zero values, line by line (Gustavson's algorithm).
+
+    Args:
+        left (ndarray | CSR): matrix of shape (m, k).
+        right (ndarray | CSR): matrix of shape (k, n).
+
+    Returns:
+        ndarray | CSR: the (m, n) product, sparse when both matrices are.
+    """
+    left_sparse, right_sparse = isinstance(left, CSR), isinstance(right, CSR)
+    if not left_sparse and not right_sparse:
+        return matmul(left, right)
+    if not left_sparse:
+        return product(transpose(right), np.ascontiguousarray(left.T)).T
+    if not right_sparse:
+        result = np.zeros((left.shape[0], right.shape[1]), dtype=complex)
+        filled = np.flatnonzero(np.diff(left.indptr))
+        if len(filled):
+            result[filled] = np.add.reduceat(left.data[:, None] * right[left.indices],\
+                left.indptr[filled], axis=0)
+        return result
+    counts = np.diff(right.indptr)[left.indices]
+    total = int(counts.sum())
+    starts = np.repeat(right.indptr[left.indices] - (np.cumsum(counts) - counts), counts)
+    positions = starts + np.arange(total)
+    return assemble(np.repeat(lines_of(left), counts), right.indices[positions],\
+        np.repeat(left.data, counts) * right.data[positions], (left.shape[0], right.shape[1]))
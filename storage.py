@@ -3,11 +3,170 @@
 
 from equations.ft_maths import IS_MATHS, IS_VARIABLE
 
-VARIABLES = []
-FUNCTIONS = []
+class SymbolTable:
+    """Stores named values. Lookups are case-insensitive and done in constant \
+    time, and the values are kept in insertion order for displaying. Storing \
+    an existing name again replaces its value and spelling, but keeps its \
+    place.
+
+    Args:
+        values (iterable, optionnal): (name, value) pairs to insert. \
+        Defaults to None.
+    """
+    def __init__(self, values = None):
+        self._entries = {}
+        if values is not None:
+            self.update(values)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name.lower() in self._entries
+
+    def __iter__(self):
+        """Iterates over the (name, value) pairs, in insertion order."""
+        return iter(self._entries.values())
+
+    def __getitem__(self, name):
+        """[] operator overload.
+
+        Raises:
+            IndexError : Unknown name.
+        """
+        try:
+            return self._entries[name.lower()][1]
+        except KeyError:
+            raise IndexError(name) from None
+
+    def __setitem__(self, name, value):
+        self._entries[name.lower()] = (name, value)
+
+    def update(self, values):
+        """Inserts several values at once.
+
+        Args:
+            values (iterable): (name, value) pairs to insert.
+        """
+        for name, value in values:
+            self[name] = value
+
+    def remove(self, *names):
+        """Removes one or several values. Unknown names are ignored.
+
+        Args:
+            names (str): names of the values to remove.
+        """
+        for name in names:
+            self._entries.pop(name.lower(), None)
+
+    def clear(self):
+        """Removes all the values."""
+        self._entries.clear()
+
+VARIABLES = SymbolTable()
+FUNCTIONS = SymbolTable()
+
+# Dependency graph between the stored values. A node of the graph is a
+# (lowercased name, is_function) pair, as returned by `symbol`.
+REFERENCES = {}
+DEPENDENTS = {}
+# Computed values of the variables, dropped whenever the variable or one
+# of the values it references is stored again.
+VALUES = {}
+
+def symbol(name, is_function = False):
+    """Returns the key of a function or a variable in the dependency graph.
+
+    Args:
+        name (str): name of the function or variable.
+        isFunction(bool, optionnal) : if set to `True`, the key is \
+        the one of a function. Defaults to `False`.
+
+    Returns:
+        tuple : key of the value.
+    """
+    return (name.lower(), is_function)
+
+def depends_on(key, target):
+    """Checks whether or not a stored value references another one, \
+    directly or through other stored values.
+
+    Args:
+        key (tuple): key of the value to check.
+        target (tuple): key of the referenced value.
+
+    Returns:
+        bool : `True` if `key` depends on `target`.
+    """
+    seen = set()
+    stack = [key]
+    while stack:
+        current = stack.pop()
+        if current == target:
+            return True
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(REFERENCES.get(current, ()))
+    return False
+
+def invalidate(key):
+    """Drops the computed value of a variable, and the ones of all \
+    the values depending on it. They will only be computed again when \
+    needed.
+
+    Args:
+        key (tuple): key of the value that changed.
+    """
+    seen = set()
+    stack = [key]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        if not current[1]:
+            VALUES.pop(current[0], None)
+        stack.extend(DEPENDENTS.get(current, ()))
+
+def link(key, references):
+    """Replaces the references of a stored value in the dependency graph.
+
+    Args:
+        key (tuple): key of the stored value.
+        references (set): keys of the values it references.
+    """
+    for reference in REFERENCES.pop(key, ()):
+        DEPENDENTS[reference].discard(key)
+    if references:
+        REFERENCES[key] = references
+    for reference in references:
+        DEPENDENTS.setdefault(reference, set()).add(key)
+
+def check_name(name, is_function = False):
+    """Checks that a name can be used to store a function or a variable.
+
+    Args:
+        name (str): name of the the value to store.
+        isFunction(bool, optionnal) : if set to `True`, the name \
+        is checked as a function name. Defaults to `False`.
+
+    Raises:
+        SyntaxError : The variable/function has a forbidden name (x)
+    """
+    if name.lower() == 'x':
+        raise SyntaxError(f"Cannot use {name} as a variable name !")
+    if is_function and name in IS_MATHS:
+        raise SyntaxError(f"Cannot overwrite default function {name} !")
+    if not is_function and name in IS_VARIABLE:
+        raise SyntaxError(f"Cannot overwrite default variable {name} !")
 
 def store(value, name, is_function = False):
-    """Stores a function or a variable.
+    """Stores a function or a variable. The values referenced by the \
+    new one are recorded, and every value depending on it will be \
+    computed again on its next use. References that would make the value \
+    depend on itself (ie a = a + 1) are replaced by their current value.
     
     Args:
         value (Node): value to save as an Abstract Syntax Tree.
@@ -18,38 +177,64 @@ def store(value, name, is_function = False):
     
     Raises:
         SyntaxError : The variable/function has a forbidden name (x)
+
+    Returns:
+        Node : the stored value.
     """
-    flag = False
-    if name.lower() == 'x':
-        raise SyntaxError(f"Cannot use {name} as a variable name !")
-    if is_function:
-        if name in IS_MATHS:
-            raise SyntaxError(f"Cannot overwrite default function {name} !")
-        for data in FUNCTIONS:
-            if data[0] == name:
-                flag = True
-                data[1] = value
-        if flag is False:
-            FUNCTIONS.append([name, value])
-    else:
-        if name in IS_VARIABLE:
-            raise SyntaxError(f"Cannot overwrite default variable {name} !")
-        for data in VARIABLES:
-            if data[0] == name:
-                flag = True
-                data[1] = value
-        if flag is False:
-            VARIABLES.append([name, value])
+    check_name(name, is_function)
+    key = symbol(name, is_function)
+    references = value.references()
+    cyclic = {reference for reference in references if depends_on(reference, key)}
+    if cyclic:
+        value = value.freeze(cyclic)
+        references = value.references()
+    (FUNCTIONS if is_function else VARIABLES)[name] = value
+    link(key, references)
+    invalidate(key)
+    return value
+
+def store_all(values, is_function = False):
+    """Stores several functions or variables at once. Nothing is \
+    stored if one of the names is forbidden.
+
+    Args:
+        values (iterable): (name, value) pairs to store.
+        isFunction(bool, optionnal) : if set to `True`, the values \
+        will be saved as functions rather than variables. Defaults \
+        to `False`.
+
+    Raises:
+        SyntaxError : One of the variables/functions has a forbidden name (x)
+    """
+    values = list(values)
+    for name, _ in values:
+        check_name(name, is_function)
+    for name, value in values:
+        store(value, name, is_function)
+
+def remove(names, is_function = False):
+    """Removes several functions or variables at once.
+
+    Args:
+        names (iterable): names of the values to remove.
+        isFunction(bool, optionnal) : if set to `True`, functions \
+        will be removed rather than variables. Defaults to `False`.
+    """
+    for name in names:
+        key = symbol(name, is_function)
+        (FUNCTIONS if is_function else VARIABLES).remove(name)
+        link(key, set())
+        invalidate(key)
 
 def display():
     """Displays the stored variable and functions.
     """
     print("### Stored Variables :")
-    for data in VARIABLES:
-        print(f"{str(data[0])} = {str(data[1])}")
+    for name, value in VARIABLES:
+        print(f"{str(name)} = {str(value)}")
     print("### Stored Functions :")
-    for data in FUNCTIONS:
-        print(f"{str(data[0])}(x) = {str(data[1])}")
+    for name, value in FUNCTIONS:
+        print(f"{str(name)}(x) = {str(value)}")
 
 def retrieve(key, is_function = False):
     """Retrieve and solve a function or a variable.
@@ -71,11 +256,24 @@ def retrieve(key, is_function = False):
         index = key.find("(")
         if index != -1:
             key = key[:index]
-        for data in FUNCTIONS:
-            if data[0].lower() == key.lower():
-                return data[1]
-    else:
-        for data in VARIABLES:
-            if data[0].lower() == key.lower():
-                return data[1]
-    raise IndexError(key)
+        return FUNCTIONS[key]
+    return VARIABLES[key]
+
+def evaluate(key):
+    """Retrieve a variable and returns its computed value. The value \
+    is only solved again if it, or one of the values it references, \
+    changed since the last time.
+
+    Args:
+        key (str): Name of the searched variable.
+
+    Raises:
+        IndexError : Unknown variable.
+
+    Returns:
+        (Complex|Matrix) : Computed stored variable.
+    """
+    name = key.lower()
+    if name not in VALUES:
+        VALUES[name] = VARIABLES[key].solve()
+    return VALUES[name]
@@ -1,11 +1,16 @@
 """A class to store the Abstract Syntax Tree"""
 
-from storage import retrieve
+import operator
 
-from ft_parser import tokenize, parse
+import numpy as np
+
+from storage import retrieve, evaluate, symbol
+
+from ft_parser import read
 from maths.complex import Complex
 from maths.matrix import Matrix
-from equations.ft_maths import IS_MATHS, IS_VARIABLE, ft_fact
+from maths.lazy import LazyMatrix
+from equations.ft_maths import IS_MATHS, ARRAY_MATHS, IS_VARIABLE, ft_fact
 
 precedence = {
     '+': 1, '-': 1,
@@ -13,6 +18,100 @@ precedence = {
     '^': 3, '**': 3
 }
 
+def matrix_product(left_value, right_value):
+    """`**` operator. True product for matrices, power otherwise."""
+    if isinstance(left_value, Matrix):
+        return left_value @ right_value
+    return left_value ** right_value
+
+OPERATORS = {
+    '^': operator.pow,
+    '**': matrix_product,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '+': operator.add,
+    '-': operator.sub
+}
+
+ELEMENT_WISE = ('+', '-', '*', '%')
+
+def chain_order(dimensions):
+    """Finds the cheapest way to parenthesise a chain of matrix products, \
+    with the classic dynamic programming algorithm, in O(n^3) for n matrices.
+
+    Args:
+        dimensions (list): the n + 1 sizes of the chain, matrix i being of \
+        size dimensions[i] x dimensions[i + 1].
+
+    Returns:
+        list[list]: `split[i][j]`, the index after which the product of the \
+        matrices i to j is best split.
+    """
+    count = len(dimensions) - 1
+    cost = [[0] * count for _ in range(count)]
+    split = [[0] * count for _ in range(count)]
+    for length in range(2, count + 1):
+        for i in range(count - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for k in range(i, j):
+                candidate = cost[i][k] + cost[k + 1][j]\
+                    + dimensions[i] * dimensions[k + 1] * dimensions[j + 1]
+                if cost[i][j] is None or candidate < cost[i][j]:
+                    cost[i][j] = candidate
+                    split[i][j] = k
+    return split
+
+def chain_product(values, split, i, j):
+    """Multiplies the matrices i to j of a chain, following the order \
+    given by `chain_order`."""
+    if i == j:
+        return values[i]
+    k = split[i][j]
+    return chain_product(values, split, i, k) @ chain_product(values, split, k + 1, j)
+
+def chain_fold(structure, values):
+    """Combines the values of a chain of `**` following the tree they \
+    came from, ie when they aren't all matrices."""
+    if isinstance(structure, int):
+        return values[structure]
+    return matrix_product(chain_fold(structure[0], values), chain_fold(structure[1], values))
+
+def array_mod(left_value, right_value):
+    """% operator for complex arrays, applied to the real and the imaginary \
+    parts like `Complex.__mod__`."""
+    right_value = np.real(right_value)
+    return np.mod(np.real(left_value), right_value)\
+        + 1j * np.mod(np.imag(left_value), right_value)
+
+ARRAY_OPERATORS = {
+    '^': np.power,
+    '**': np.power,
+    '*': np.multiply,
+    '/': np.divide,
+    '%': array_mod,
+    '+': np.add,
+    '-': np.subtract
+}
+
+def to_array_value(value):
+    """Converts a scalar result to a value usable inside a complex \
+    array. Values that can't be converted (ie matrices) are kept as is."""
+    if isinstance(value, (Complex, int, float, complex)):
+        return complex(value)
+    return value
+
+def to_array_scalar(value):
+    """Converts the value of a stored variable for an array callable.
+
+    Raises:
+        NotVectorized: the value isn't a scalar.
+    """
+    if isinstance(value, (Complex, int, float, complex)):
+        return complex(value)
+    raise NotVectorized()
+
 def pseudo_execute(execute_type, tokens):
     """A pseudo execution to use inside function calls. To handle cases such as 
     f(3 + 4), f(4i), or even f(g(x)). 
@@ -50,14 +149,43 @@ def pseudo_execute(execute_type, tokens):
         case _:
             return None
 
+class NotVectorized(Exception):
+    """Raised by an array callable when a stored variable holds a value \
+    that can't be put in a complex array (ie a matrix). It goes up to \
+    the callable returned by `Node.compile_array`, which then falls \
+    back to solving the whole tree point by point."""
+
 class FunctionCall:
-    """Stores Function calls."""
-    def __init__(self, ast, value):
-        self.ast = ast
+    """Stores Function calls. The function is retrieved by name when \
+    solved, so that it follows its redefinitions."""
+    def __init__(self, name, value):
+        self.name = name
         self.value = value
 
+    def solve(self, x = None):
+        """Solves the function for the stored value, using the \
+        function's compiled tree.
+
+        Args:
+            x (any): value for x, if the argument of the call uses it. \
+            defaults to None.
+        """
+        argument = self.value.solve(x)
+        if self.name in IS_MATHS:
+            return IS_MATHS[self.name](argument)
+        return retrieve(self.name, True).compile()(argument)
+
     def __str__(self):
-        return f"{self.ast}({self.value})"
+        return f"{self.name}({self.value})"
+
+class VariableStore:
+    """Stores a variable name. The variable is retrieved when solved, \
+    so that it follows its reassignments."""
+    def __init__(self, name):
+        self.name = name
+
+    def __str__(self):
+        return self.name
 
 class FunctionStore:
     """Stores a function name and value."""
@@ -68,12 +196,26 @@ class FunctionStore:
     def __str__(self):
         return f"{self.name}({self.value})"
 
+def compiled_x(x):
+    """Compiled x leaf.
+
+    Raises:
+        ValueError : x is used outside of an equation solving.
+    """
+    if x is None:
+        raise ValueError("x used outside of an equation or a function !")
+    return x
+
 class Node:
-    """Abstract Syntax Tree class."""
+    """Abstract Syntax Tree class. A node is immutable once built, so \
+    that the callables compiled from it, and kept by its parents, \
+    always match the tree. Rewrites (ie `reduce`) build new nodes."""
     def __init__(self, value, left=None, right=None):
-        self.value = value
-        self.left = left
-        self.right = right
+        self._value = value
+        self._left = left
+        self._right = right
+        self._compiled = None
+        self._compiled_array = None
 
     def __str__(self):
         if self.left and self.right:
@@ -110,9 +252,67 @@ class Node:
                 return True
         return False
 
+    def is_static(self):
+        """Checks whether or not the node can be solved once and for all, \
+        ie it uses neither x nor any stored value."""
+        if isinstance(self.value, (VariableStore, FunctionStore, FunctionCall)):
+            return False
+        if isinstance(self.value, Node):
+            return self.value.is_static()
+        if self.left is None and self.right is None:
+            return self.value != 'x'
+        return self.left.is_static() and self.right.is_static()
+
+    def references(self):
+        """Lists the stored variables and functions used by the tree.
+
+        Returns:
+            set : keys of the referenced values, as given by `storage.symbol`.
+        """
+        if isinstance(self.value, VariableStore):
+            return {symbol(self.value.name)}
+        if isinstance(self.value, FunctionStore):
+            return set() if self.value.name in IS_MATHS else {symbol(self.value.name, True)}
+        if isinstance(self.value, FunctionCall):
+            references = self.value.value.references()
+            if self.value.name not in IS_MATHS:
+                references.add(symbol(self.value.name, True))
+            return references
+        if isinstance(self.value, Node):
+            return self.value.references()
+        if self.left is None and self.right is None:
+            return set()
+        return self.left.references() | self.right.references()
+
+    def freeze(self, references):
+        """Replaces some references to stored values by their current \
+        value. Calls to functions are only replaced if their argument \
+        doesn't use x.
+
+        Args:
+            references (set): keys of the values to replace, as given \
+            by `storage.symbol`.
+
+        Returns:
+            Node : the updated tree. The node itself is left unchanged.
+        """
+        if isinstance(self.value, VariableStore):
+            if symbol(self.value.name) in references:
+                return Node(evaluate(self.value.name))
+            return self
+        if isinstance(self.value, FunctionCall):
+            if symbol(self.value.name, True) in references and self.value.value.is_static():
+                return Node(self.value.solve())
+            return Node(FunctionCall(self.value.name, self.value.value.freeze(references)))
+        if isinstance(self.value, Node):
+            return self.value.freeze(references)
+        if self.left is None and self.right is None:
+            return self
+        return Node(self.value, self.left.freeze(references), self.right.freeze(references))
+
     def solve(self, x = None):
-        """Solves the node, calling itself recursirvely if
-        one of the leafs is another node.
+        """Solves the node through its compiled callable, compiling
+        the tree on first use.
         
         Args:
             x (any): value for x in case of a function solving. \
@@ -127,38 +327,246 @@ class Node:
             (Complex | Matrix) : computed result either as a Complex or \
             a Matrix.
         """
-        if isinstance(self.value, FunctionCall):
-            return self.value.ast.solve(self.value.value)
-        if isinstance(self.value, FunctionStore):
-            return retrieve(self.value.name, True).solve(x)
-        if self.left is None and self.right is None:
-            if self.value == 'x' and x is not None:
-                return x
-            elif self.value == 'x' and x is None:
-                raise ValueError("x used outside of an equation or a function !")
-            return self.value
-        left_value = self.left.solve(x)
-        right_value = self.right.solve(x)
-        match self.value:
-            case '^':
-                return left_value ** right_value
-            case '**':
-                if isinstance(left_value, Matrix):
-                    return left_value @ right_value
-                else:
-                    return left_value ** right_value
-            case '*':
-                return left_value * right_value
-            case '/':
-                return left_value / right_value
-            case '%':
-                return left_value % right_value
-            case '+':
-                return left_value + right_value
-            case '-':
-                return left_value - right_value
-            case _:
-                raise AttributeError(f"Unknown operator {self.value} !")
+        return self.compile()(x)
+
+    def compile(self):
+        """Compiles the tree into a single callable `f(x)`, with the \
+        operators, the constants and the x leaf bound ahead of time. \
+        As nodes are immutable, the callable is built once and cached \
+        on the node.
+
+        Raises:
+            AttributeError: unknown operator was used.
+
+        Returns:
+            (function) : compiled tree, taking the value of x (or None).
+        """
+        if self._compiled is None:
+            self._compiled = self.__build()
+        return self._compiled
+
+    def __build(self):
+        """Builds the callable for the node, compiling the leafs \
+        first."""
+        value = self._value
+        if isinstance(value, VariableStore):
+            name = value.name
+            return lambda x: evaluate(name)
+        if isinstance(value, FunctionCall):
+            name = value.name
+            argument = value.value.compile()
+            if name in IS_MATHS:
+                function = IS_MATHS[name]
+                return lambda x: function(argument(x))
+            return lambda x: retrieve(name, True).compile()(argument(x))
+        if isinstance(value, FunctionStore):
+            name = value.name
+            if name in IS_MATHS:
+                return IS_MATHS[name]
+            return lambda x: retrieve(name, True).compile()(x)
+        if self._left is None and self._right is None:
+            if isinstance(value, Node):
+                return value.compile()
+            if value == 'x':
+                return compiled_x
+            return lambda x: value
+        if value not in OPERATORS:
+            raise AttributeError(f"Unknown operator {value} !")
+        if value == '**' and (self._left.value == '**' or self._right.value == '**'):
+            return self.__build_chain()
+        if value in ELEMENT_WISE and (self._left.value in ELEMENT_WISE\
+                or self._right.value in ELEMENT_WISE):
+            return self.__build_fused()
+        op = OPERATORS[value]
+        left = self._left.compile()
+        right = self._right.compile()
+        return lambda x: op(left(x), right(x))
+
+    def __build_chain(self):
+        """Builds the callable for a chain of `**`, ie A ** B ** C. When \
+        all the operands are matrices, they are multiplied in the cheapest \
+        order for their sizes. The order is planned once per set of sizes, \
+        and kept with the callable."""
+        operands = []
+        def flatten(node):
+            if node.value == '**' and node.left is not None and node.right is not None:
+                return (flatten(node.left), flatten(node.right))
+            operands.append(node.compile())
+            return len(operands) - 1
+        structure = flatten(self)
+        plans = {}
+        def chain(x):
+            values = [operand(x) for operand in operands]
+            if not all(isinstance(data, Matrix) for data in values)\
+                    or any(values[i].columns != values[i + 1].lines\
+                        for i in range(len(values) - 1)):
+                return chain_fold(structure, values)
+            dimensions = tuple([values[0].lines] + [data.columns for data in values])
+            if dimensions not in plans:
+                plans[dimensions] = chain_order(dimensions)
+            return chain_product(values, plans[dimensions], 0, len(values) - 1)
+        return chain
+
+    def __build_fused(self):
+        """Builds the callable for a tree of `+`, `-`, `*` and `%`, ie \
+        A + B - C * 2. Matrices met on the leafs are wrapped in a \
+        `LazyMatrix`, so the operators build an expression instead of a \
+        temporary matrix each, and the expression is computed in one \
+        pass at the root. Constant leafs are wrapped ahead of time, so \
+        trees without matrices run as fast as before."""
+        def flatten(node):
+            if node.value in ELEMENT_WISE and node.left is not None and node.right is not None:
+                op = OPERATORS[node.value]
+                left, right = flatten(node.left), flatten(node.right)
+                return lambda x: op(left(x), right(x))
+            operand = node.compile()
+            if node.is_constant():
+                return operand
+            if isinstance(node.value, Matrix) and node.left is None:
+                value = LazyMatrix.wrap(node.value)
+                return lambda x: value
+            def leaf(x):
+                value = operand(x)
+                if isinstance(value, Matrix):
+                    return LazyMatrix.wrap(value)
+                return value
+            return leaf
+        combine = flatten(self)
+        def fused(x):
+            result = combine(x)
+            if isinstance(result, LazyMatrix):
+                return result.evaluate()
+            return result
+        return fused
+
+    def solve_array(self, x_values):
+        """Solves the node for a whole array of values for x in one \
+        pass. Points where the function is undefined (ie divided by 0) \
+        yield `nan` or `inf` rather than raising.
+
+        Args:
+            x_values (ndarray): values for x.
+
+        Returns:
+            (ndarray) : computed results as a complex array, or an \
+            object array if some of the results are matrices.
+        """
+        x_values = np.asarray(x_values, dtype=complex)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            result = np.broadcast_to(self.compile_array()(x_values), x_values.shape)
+        if result.dtype == object:
+            try:
+                return result.astype(complex)
+            except TypeError:
+                return result
+        return result.astype(complex)
+
+    def compile_array(self):
+        """Compiles the tree into a single callable working on a whole \
+        complex array of values for x. The nodes that can't be vectorized \
+        (ie matrices) fall back to the scalar compiled tree, point by \
+        point. Stored variables are only known when the callable runs: \
+        if one of them holds a matrix, the whole tree is solved point by \
+        point for that call. Cached like `compile`.
+
+        Raises:
+            AttributeError: unknown operator was used.
+
+        Returns:
+            (function) : compiled tree, taking an array of values for x.
+        """
+        built, vectorized = self.__compile_array()
+        if not vectorized:
+            return built
+        def guarded(x_values):
+            try:
+                return built(x_values)
+            except NotVectorized:
+                return self.__build_pointwise()(x_values)
+        return guarded
+
+    def __compile_array(self):
+        """Returns the cached array callable, along with whether or not \
+        it is actually vectorized."""
+        if self._compiled_array is None:
+            built = self.__build_array()
+            if built is None:
+                self._compiled_array = (self.__build_pointwise(), False)
+            else:
+                self._compiled_array = (built, True)
+        return self._compiled_array
+
+    def __build_array(self):
+        """Builds the array callable for the node, compiling the leafs \
+        first. Returns None if the node, or one of its leafs, can't be \
+        vectorized."""
+        value = self._value
+        if isinstance(value, VariableStore):
+            name = value.name
+            return lambda x: to_array_scalar(evaluate(name))
+        if isinstance(value, FunctionCall):
+            name = value.name
+            argument, vectorized = value.value.__compile_array()
+            if not vectorized:
+                return None
+            if name in ARRAY_MATHS:
+                kernel = ARRAY_MATHS[name]
+                return lambda x: kernel(argument(x))
+            if name in IS_MATHS:
+                return None
+            return lambda x: retrieve(name, True).__compile_array()[0]\
+                (np.broadcast_to(argument(x), np.shape(x)))
+        if isinstance(value, FunctionStore):
+            name = value.name
+            if name in ARRAY_MATHS:
+                return ARRAY_MATHS[name]
+            if name in IS_MATHS:
+                return None
+            return lambda x: retrieve(name, True).__compile_array()[0](x)
+        if self._left is None and self._right is None:
+            if isinstance(value, Node):
+                built, vectorized = value.__compile_array()
+                return built if vectorized else None
+            if value == 'x':
+                return lambda x: x
+            if isinstance(value, (Complex, int, float)):
+                constant = complex(value)
+                return lambda x: constant
+            return None
+        if value not in ARRAY_OPERATORS:
+            raise AttributeError(f"Unknown operator {value} !")
+        op = ARRAY_OPERATORS[value]
+        left, left_vectorized = self._left.__compile_array()
+        right, right_vectorized = self._right.__compile_array()
+        if not (left_vectorized and right_vectorized):
+            return None
+        return lambda x: op(left(x), right(x))
+
+    def __build_pointwise(self):
+        """Builds the scalar fallback of the array callable, solving \
+        the node once per value of x."""
+        scalar = self.compile()
+        def pointwise(x_values):
+            result = np.empty(x_values.shape, dtype=object)
+            for index, x in np.ndenumerate(x_values):
+                result[index] = to_array_value(scalar(Complex(x.real, x.imag)))
+            return result
+        return pointwise
+
+    @property
+    def value(self):
+        """Returns the value of the node."""
+        return self._value
+
+    @property
+    def left(self):
+        """Returns the left leaf of the node."""
+        return self._left
+
+    @property
+    def right(self):
+        """Returns the right leaf of the node."""
+        return self._right
 
     def reduce(self):
         """Recuehfuhefuhefuzvnr"""
@@ -170,8 +578,7 @@ class Node:
             case '^':
                 if left.is_constant() and right.is_constant():
                     return Node(left.value ** right.value)
-                if right.is_zero():
-                    return Node(Complex(1))
+                #no x^0 -> 1: x may be a matrix, whose power 0 is the identity
                 if right.is_one():
                     return left
                 if left.value == '^':
@@ -180,8 +587,7 @@ class Node:
             case '*':
                 if left.is_constant() and right.is_constant():
                     return Node(left.value * right.value)
-                if left.is_zero() or right.is_zero():
-                    return Node(Complex(0))
+                #no x*0 -> 0: x may be a matrix, whose product by 0 is a matrix
                 if left.is_one():
                     return right
                 if right.is_one():
@@ -231,6 +637,28 @@ class Node:
             case _:
                 return Node(self.value, left, right)
 
+def build_argument(value):
+    """Builds the tree of the argument of a function call, so that \
+    the call follows the stored values it uses.
+
+    Args:
+        value (str): the argument, as written between the parenthesis.
+
+    Returns:
+        Node : the argument's tree.
+    """
+    try:
+        return Node(Complex(float(value)))
+    except ValueError:
+        pass
+    parsed = read(value)
+    tokens = parsed["tokens"]
+    if parsed["type"] == "EXPRESSION" and isinstance(tokens, tuple) and tokens[0] != "OP":
+        tokens = [tokens]
+    if parsed["type"] == "EXPRESSION" and isinstance(tokens, list):
+        return build_ast(tokens)
+    return Node(pseudo_execute(parsed["type"], tokens))
+
 def builder(index, tokens, min_precedence=1):
     """Recursively parses the token list to create the \
     Abstract Syntax Tree.
@@ -252,13 +680,9 @@ def builder(index, tokens, min_precedence=1):
         if tokens[0] == "MATRIX":
             return Matrix(tokens[1], True)
         if tokens[0] == "FACT":
-            cmp = Complex(0)
-            cmp.read(tokens)
-            return Complex(ft_fact(cmp))
+            return Complex(ft_fact(int(tokens[1][:-1])))
         if tokens[0] == "COMPLEX":
-            cmp = Complex(0)
-            cmp.read(tokens)
-            return cmp
+            return Complex.read(tokens)
         if tokens[0] == "FUNC_DEF":
             start = tokens[1].find("(")
             end = tokens[1].rfind(")")
@@ -270,7 +694,7 @@ def builder(index, tokens, min_precedence=1):
         if tokens[0] == 'VAR':
             if tokens[1] in IS_VARIABLE:
                 return IS_VARIABLE[tokens[1]]
-            return retrieve(tokens[1]).solve()
+            return evaluate(tokens[1])
         if tokens[0] == "FUNC_CALL":
             start = tokens[1].find("(")
             end = tokens[1].rfind(")")
@@ -280,8 +704,7 @@ def builder(index, tokens, min_precedence=1):
             try:
                 f_value = Complex(float(value))
             except ValueError:
-                new_tokens = tokenize(value)
-                parsed = parse(new_tokens)
+                parsed = read(value)
                 f_value = pseudo_execute(parsed["type"], parsed["tokens"])
             func_name = tokens[1][:start]
             if func_name in IS_MATHS:
@@ -299,14 +722,13 @@ def builder(index, tokens, min_precedence=1):
     else:
         token_type, token_value = token
         if token_type == "FACT":
-            left = Node(Complex(ft_fact(float(token_value[:len(token_value)-1]))))
+            left = Node(Complex(ft_fact(int(token_value[:len(token_value)-1]))))
         elif token_type == "INTEGER":
             left = Node(Complex(int(token_value)))
         elif token_type == "DECIMAL":
             left = Node(Complex(float(token_value)))
         elif token_type == "COMPLEX":
-            left = Node(Complex(0, 0))
-            left.value.read(token)
+            left = Node(Complex.read(token))
         elif token_type == "MATRIX":
             left = Node(Matrix(token_value))
         elif token_type == "FUNC_DEF":
@@ -324,26 +746,22 @@ def builder(index, tokens, min_precedence=1):
                 if token_value in IS_VARIABLE:
                     left = Node(IS_VARIABLE[token_value])
                 else:
-                    left = Node(retrieve(token_value).solve())
+                    retrieve(token_value)
+                    left = Node(VariableStore(token_value))
             elif token_type == "FUNC_CALL":
                 start = token_value.find("(")
                 end = token_value.find(")")
                 if start == -1 or end == -1 or start == end:
                     raise IndexError("Value for x of function call couldn't be found.")
-                value = token_value[start + 1:end]
-                try:
-                    f_value = Complex(float(value))
-                except ValueError:
-                    new_tokens = tokenize(value)
-                    parsed = parse(new_tokens)
-                    f_value = pseudo_execute(parsed["type"], parsed["tokens"])
+                argument = build_argument(token_value[start + 1:end])
                 func_name = token_value[:start]
-                if func_name in IS_MATHS:
-                    final_value = IS_MATHS[func_name](f_value)
+                if func_name in IS_MATHS and argument.is_static():
+                    final_value = IS_MATHS[func_name](argument.solve())
                     left = Node(final_value)
                 else:
-                    ast = retrieve(func_name, True)
-                    left = Node(FunctionCall(ast, f_value))
+                    if func_name not in IS_MATHS:
+                        retrieve(func_name, True)
+                    left = Node(FunctionCall(func_name, argument))
         else:
             left = Node(token_value)
     index += 1